@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+ThomazTrade Indicator Benchmark
+Times the vectorized indicator kernels at growing series lengths
+
+Each kernel should scale linearly with the number of bars and stay within
+a small constant factor of a plain rolling mean over the same data. Both
+are checked and the script exits with status 1 when a kernel is over:
+
+- growth: time ratio between consecutive sizes divided by the size ratio,
+  at most MAX_GROWTH (1.0 is linear; a quadratic kernel gives 10 per 10x)
+- x mean: time at the largest size relative to rolling_mean, at most
+  MAX_FACTOR or the kernel's entry in FACTOR_BOUNDS
+"""
+
+import sys
+import time
+
+from src import indicator_kernels as kernels
+from src.market_simulator import MarketSimulator
+
+SIZES = [10_000, 100_000, 1_000_000]
+REPEATS = 5
+
+MAX_GROWTH = 3.0
+MAX_FACTOR = 5.0
+# adx runs three Wilder smoothings plus the DX average (about 8x a rolling
+# mean); keltner is an EMA plus an ATR (about 4x)
+FACTOR_BOUNDS = {'adx': 12.0, 'keltner': 6.0}
+
+KERNELS = {
+    'rolling_mean': lambda d: kernels.rolling_mean(d['close'], 20),
+    'atr': lambda d: kernels.atr(d['high'], d['low'], d['close'], 14),
+    'adx': lambda d: kernels.dmi(d['high'], d['low'], d['close'], 14),
+    'vwap': lambda d: kernels.vwap(d['high'], d['low'], d['close'], d['volume']),
+    'vwap_20': lambda d: kernels.vwap(d['high'], d['low'], d['close'], d['volume'], 20),
+    'obv': lambda d: kernels.obv(d['close'], d['volume']),
+    'keltner': lambda d: kernels.keltner(d['high'], d['low'], d['close']),
+}
+
+
+def best_time(func, data) -> float:
+    """Best wall time of REPEATS runs in seconds"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check(name, times, sizes, baseline):
+    """(max growth, x mean factor, failures) of one kernel's timings"""
+    growth = max((t1 / t0) / (n1 / n0) for t0, t1, n0, n1 in zip(times, times[1:], sizes, sizes[1:])) \
+        if len(times) > 1 else 1.0
+    factor = times[-1] / baseline
+    failures = []
+    if growth > MAX_GROWTH:
+        failures.append(f"{name}: growth {growth:.1f} > {MAX_GROWTH:.1f}")
+    bound = FACTOR_BOUNDS.get(name, MAX_FACTOR)
+    if factor > bound:
+        failures.append(f"{name}: {factor:.1f}x mean > {bound:.1f}x")
+    return growth, factor, failures
+
+
+def run_benchmark(sizes=SIZES):
+    """Time every kernel, print the table and return the failed bounds"""
+    simulator = MarketSimulator(seed=42)
+    timings = {name: [] for name in KERNELS}
+
+    for size in sizes:
+        bars = simulator.generate_bars('BENCH', size)
+        data = {
+            'open': bars[:, 0].copy(),
+            'high': bars[:, 1].copy(),
+            'low': bars[:, 2].copy(),
+            'close': bars[:, 3].copy(),
+            'volume': bars[:, 4].copy(),
+        }
+        for name, func in KERNELS.items():
+            timings[name].append(best_time(func, data))
+
+    print(f"{'kernel':<14}" + ''.join(f"{size:>14,}" for size in sizes)
+          + f"{'ns/bar':>10}{'growth':>10}{'x mean':>10}")
+    baseline = timings['rolling_mean'][-1]
+    failures = []
+    for name, times in timings.items():
+        growth, factor, kernel_failures = check(name, times, sizes, baseline)
+        failures.extend(kernel_failures)
+        per_bar = times[-1] / sizes[-1] * 1e9
+        row = ''.join(f"{t * 1000:>12.2f}ms" for t in times)
+        flag = '  FAIL' if kernel_failures else ''
+        print(f"{name:<14}{row}{per_bar:>10.1f}{growth:>10.1f}{factor:>10.1f}{flag}")
+
+    return failures
+
+
+if __name__ == '__main__':
+    sizes = sorted(int(arg) for arg in sys.argv[1:]) or SIZES
+    failures = run_benchmark(sizes)
+    if failures:
+        print("\nOver bounds:\n  " + "\n  ".join(failures))
+        sys.exit(1)
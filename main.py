@@ -15,7 +15,9 @@ from src.signal_generator import SignalGenerator
 from src.telegram_service import TelegramService
 from src.whatsapp_service import WhatsAppService
 from src.signal_history import SignalHistory
+from src.signal_record import Action
 from src.database_service import DatabaseService
+from src.config import get_config
 from src.logger import setup_logging
 
 
@@ -31,6 +33,10 @@ def main():
     logger.info("Starting ThomazTrade Bot...")
     
     try:
+        # Load shared configuration and apply edits to config.json live
+        config = get_config()
+        config.start_watching()
+        
         # Initialize services
         data_provider = DataProvider()
         signal_generator = SignalGenerator()
@@ -69,7 +75,10 @@ def main():
                         # Send to WhatsApp
                         whatsapp_service.send_message(message)
                         
-                        logger.info(f"Signal sent: {signal['symbol']} - {signal['action']}")
+                        logger.info(f"Signal sent: {signal.symbol} - {signal.action.value}")
+                    
+                    # Write signals queued by a batched history
+                    signal_history.flush()
                 else:
                     logger.info("No signals generated")
                     
@@ -78,15 +87,15 @@ def main():
         
         def format_signal_message(signal):
             """Format signal data into readable message"""
-            action_emoji = '🟢 COMPRAR' if signal['action'] == 'buy' else '🔴 VENDER'
+            action_emoji = '🟢 COMPRAR' if signal.action is Action.BUY else '🔴 VENDER'
             return f"""❗️❗️❗️ SINAL DE TRADE ❗️❗️❗️
 
-📈 Ativo: {signal['symbol']}
+📈 Ativo: {signal.symbol}
 📊 Direção: {action_emoji}
-💰 Preço: ${signal['price']:.2f}
-📊 Confiança: {signal['confidence']:.1f}%
-🔍 Indicadores: {', '.join(signal['indicators'])}
-🕒 Horário: {signal['timestamp'][:19].replace('T', ' ')}
+💰 Preço: ${signal.price:.2f}
+📊 Confiança: {signal.confidence:.1f}%
+🔍 Indicadores: {', '.join(signal.indicators)}
+🕒 Horário: {signal.timestamp[:19].replace('T', ' ')}
 
 ⚠️ Aguarde confirmação antes de entrar.
 
@@ -0,0 +1,150 @@
+"""
+Backtester Module
+Replays OHLCV history through the SignalGenerator rules to score them
+"""
+
+import logging
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+
+from .config import get_config
+from .indicator_plan import IndicatorPlan
+from .signal_generator import SignalGenerator
+from .signal_rules import RuleSet
+from .technical_indicators import TechnicalIndicators
+
+OHLCV = ('open', 'high', 'low', 'close', 'volume')
+EVENT_COLUMNS = ['symbol', 'rule', 'action', 'timestamp', 'price', 'confidence', 'forward_return']
+
+
+class BacktestReport:
+    """
+    Results of a backtest run
+
+    `events` holds one row per signal with its forward return, signed so
+    that a positive value means the signal was right (a falling price after
+    a sell counts as a gain). `by_rule` and `by_symbol` aggregate them into
+    signal count, hit rate, average forward return and maximum drawdown of
+    the cumulative forward returns taken in time order.
+    """
+
+    def __init__(self, events: pd.DataFrame, horizon: int):
+        self.events = events
+        self.horizon = horizon
+        self.by_rule = _summarize(events, 'rule')
+        self.by_symbol = _summarize(events, 'symbol')
+
+    def __str__(self) -> str:
+        return (f"Backtest: {len(self.events)} signals, {self.horizon}-bar forward returns\n\n"
+                f"By rule:\n{self.by_rule.to_string()}\n\n"
+                f"By symbol:\n{self.by_symbol.to_string()}")
+
+
+def _max_drawdown(returns: np.ndarray) -> float:
+    """Largest peak-to-trough fall of the cumulative sum of returns"""
+    equity = np.concatenate(([0.0], np.cumsum(returns)))
+    return float(np.max(np.maximum.accumulate(equity) - equity))
+
+
+def _summarize(events: pd.DataFrame, key: str) -> pd.DataFrame:
+    columns = ['signals', 'hit_rate', 'avg_return', 'max_drawdown']
+    scored = events.dropna(subset=['forward_return'])
+    if scored.empty:
+        return pd.DataFrame(columns=columns)
+
+    scored = scored.sort_values('timestamp', kind='stable')
+    rows = {}
+    for name, group in scored.groupby(key, sort=True):
+        returns = group['forward_return'].to_numpy()
+        rows[name] = {
+            'signals': len(returns),
+            'hit_rate': float(np.mean(returns > 0)),
+            'avg_return': float(np.mean(returns)),
+            'max_drawdown': _max_drawdown(returns)
+        }
+    return pd.DataFrame.from_dict(rows, orient='index', columns=columns).rename_axis(key)
+
+
+class Backtester:
+    """
+    Vectorized backtest of the enabled signal rules
+
+    Symbols are processed in chunks: each chunk's indicators are computed
+    as one (symbols x bars) panel with the same IndicatorPlan and RuleSet
+    as the live SignalGenerator, and every rule is evaluated once over the
+    whole chunk. Signals therefore match what the bot would have sent on
+    each bar (with the full history before it), including the
+    MIN_BARS warm-up and the min_confidence filter; the per-run limit is
+    not applied.
+    """
+
+    def __init__(self, config: Any = None, horizon: int = None,
+                 min_confidence: float = None, chunk_symbols: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.config = config or get_config()
+        backtest_config = self.config.get('backtest', {})
+        self.horizon = int(horizon or backtest_config.get('horizon_bars', 24))
+        self.chunk_symbols = int(chunk_symbols or backtest_config.get('chunk_symbols', 16))
+        if min_confidence is None:
+            min_confidence = self.config.notifications.min_confidence
+        self.min_confidence = min_confidence
+
+        self.rules = RuleSet.from_config(self.config)
+        self.plan = IndicatorPlan([c for c in self.rules.columns if c not in OHLCV], self.config)
+
+    def run(self, market_data: Dict[str, pd.DataFrame]) -> BacktestReport:
+        """Backtest every symbol's history; returns the per-signal events and summaries"""
+        eligible = {symbol: df for symbol, df in market_data.items() if len(df) >= SignalGenerator.MIN_BARS}
+        symbols = list(eligible)
+
+        parts = []
+        for start in range(0, len(symbols), self.chunk_symbols):
+            chunk = {symbol: eligible[symbol] for symbol in symbols[start:start + self.chunk_symbols]}
+            try:
+                parts.append(self._run_chunk(chunk))
+            except Exception as e:
+                self.logger.error(f"Error backtesting {', '.join(chunk)}: {str(e)}")
+
+        events = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=EVENT_COLUMNS)
+        return BacktestReport(events, self.horizon)
+
+    def _run_chunk(self, chunk: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        block, names = TechnicalIndicators.calculate_panel_block(chunk, self.config, self.plan.columns)
+        columns = {name: block[..., i] for i, name in enumerate(names)}
+        num_symbols, num_bars = block.shape[:2]
+
+        # Bars each row may signal on: after the warm-up of its own history
+        lengths = np.array([len(df) for df in chunk.values()])
+        first_bar = num_bars - lengths + SignalGenerator.MIN_BARS - 1
+        eligible = np.arange(num_bars) >= first_bar[:, None]
+
+        close = columns['close']
+        future = np.full(close.shape, np.nan)
+        if self.horizon < num_bars:
+            future[:, :-self.horizon] = close[:, self.horizon:]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            forward = future / close - 1
+
+        timestamps = np.zeros((num_symbols, num_bars), dtype='datetime64[ns]')
+        for row, df in enumerate(chunk.values()):
+            timestamps[row, num_bars - len(df):] = df.index.to_numpy(dtype='datetime64[ns]')
+
+        symbols = np.array(list(chunk), dtype=object)
+        parts: List[pd.DataFrame] = []
+        for match in self.rules.evaluate(columns):
+            rows, bars = np.nonzero(match.mask & eligible & (match.confidence >= self.min_confidence))
+            if not len(rows):
+                continue
+            sign = 1.0 if match.rule.action == 'buy' else -1.0
+            parts.append(pd.DataFrame({
+                'symbol': symbols[rows],
+                'rule': match.rule.name,
+                'action': match.rule.action,
+                'timestamp': timestamps[rows, bars],
+                'price': close[rows, bars],
+                'confidence': match.confidence[rows, bars],
+                'forward_return': sign * forward[rows, bars]
+            }))
+
+        return pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=EVENT_COLUMNS)
@@ -0,0 +1,100 @@
+"""
+Bar Buffer Module
+Fixed-capacity rolling OHLCV window per symbol
+"""
+
+from typing import List
+import numpy as np
+import pandas as pd
+
+from .market_simulator import OHLCV_COLUMNS
+
+
+class BarRingBuffer:
+    """
+    Ring buffer holding the last `capacity` bars of a symbol
+
+    Every bar is written twice, at slot i and at slot i + capacity, so the
+    current window is always one contiguous slice of the backing array.
+    That lets window() and to_frame() hand out views instead of copies and
+    makes an append cost proportional to the number of new bars only.
+    """
+
+    def __init__(self, capacity: int, columns: List[str] = None):
+        if capacity <= 0:
+            raise ValueError("Buffer capacity must be positive")
+
+        self.capacity = capacity
+        self.columns = list(columns or OHLCV_COLUMNS)
+        self._values = np.full((2 * capacity, len(self.columns)), np.nan)
+        self._times = np.zeros(2 * capacity, dtype='datetime64[ns]')
+        self._pos = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamps: np.ndarray, values: np.ndarray):
+        """
+        Append bars to the buffer
+
+        Args:
+            timestamps: Bar timestamps, shape (n,)
+            values: Bar values in column order, shape (n, len(columns))
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.columns))
+        count = len(values)
+        if count == 0:
+            return
+
+        # Only the newest `capacity` bars can survive the write
+        if count > self.capacity:
+            skipped = count - self.capacity
+            timestamps = timestamps[skipped:]
+            values = values[skipped:]
+            self._pos = (self._pos + skipped) % self.capacity
+            count = self.capacity
+
+        slots = (self._pos + np.arange(count)) % self.capacity
+        self._values[slots] = values
+        self._values[slots + self.capacity] = values
+        self._times[slots] = timestamps
+        self._times[slots + self.capacity] = timestamps
+
+        self._pos = (self._pos + count) % self.capacity
+        self._size = min(self._size + count, self.capacity)
+
+    def _window_slice(self) -> slice:
+        start = (self._pos - self._size) % self.capacity if self._size else 0
+        return slice(start, start + self._size)
+
+    def window(self) -> np.ndarray:
+        """Current bars, oldest first, as a view of shape (len, len(columns))"""
+        return self._values[self._window_slice()]
+
+    def timestamps(self) -> np.ndarray:
+        """Timestamps of the current bars as a view"""
+        return self._times[self._window_slice()]
+
+    @property
+    def last_timestamp(self) -> pd.Timestamp:
+        """Timestamp of the newest bar"""
+        if not self._size:
+            return None
+        return pd.Timestamp(self._times[(self._pos - 1) % self.capacity])
+
+    def last(self, column: str) -> float:
+        """Newest value of a column"""
+        if not self._size:
+            return None
+        return float(self._values[(self._pos - 1) % self.capacity, self.columns.index(column)])
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Current window as a DataFrame backed by the buffer memory
+        The frame shares memory with the buffer, so it reflects later
+        appends; take a copy if it must outlive the next update.
+        """
+        index = pd.DatetimeIndex(self.timestamps(), name='timestamp')
+        return pd.DataFrame(self.window(), index=index, columns=self.columns, copy=False)
@@ -0,0 +1,208 @@
+"""
+Bar Store Module
+Memory-mapped columnar OHLCV storage on disk
+"""
+
+import json
+import os
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from .market_simulator import OHLCV_COLUMNS
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class BarStore:
+    """
+    Append-only OHLCV store with one memory-mapped file per column
+
+    Each symbol has a directory holding `timestamp.bin` (int64 nanoseconds,
+    strictly increasing) plus one float64 file per OHLCV column, and a
+    `meta.json` recording how many rows are committed. Appends write the
+    column files first, fsync them and only then publish the new length by
+    atomically replacing meta.json, so a crash mid-append leaves the previous
+    length in place and the partial tail is truncated on the next append.
+    Readers map only the committed rows read-only, which lets several
+    processes read while one process appends.
+    """
+
+    META_FILE = 'meta.json'
+    LOCK_FILE = '.lock'
+    TIMESTAMP_COLUMN = 'timestamp'
+
+    def __init__(self, root: str, columns: List[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        self.columns = list(columns or OHLCV_COLUMNS)
+        os.makedirs(root, exist_ok=True)
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol)
+
+    def _column_path(self, symbol: str, column: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), f'{column}.bin')
+
+    def _dtype(self, column: str) -> np.dtype:
+        return np.dtype(np.int64) if column == self.TIMESTAMP_COLUMN else np.dtype(np.float64)
+
+    def symbols(self) -> List[str]:
+        """Symbols with committed data"""
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.exists(os.path.join(self.root, name, self.META_FILE))
+        )
+
+    def length(self, symbol: str) -> int:
+        """Number of committed rows for a symbol"""
+        meta_path = os.path.join(self._symbol_dir(symbol), self.META_FILE)
+        try:
+            with open(meta_path, 'r') as f:
+                return int(json.load(f)['length'])
+        except FileNotFoundError:
+            return 0
+
+    def _write_meta(self, symbol: str, length: int):
+        """Publish the committed length with an atomic rename"""
+        symbol_dir = self._symbol_dir(symbol)
+        meta_path = os.path.join(symbol_dir, self.META_FILE)
+        tmp_path = meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'length': length, 'columns': self.columns}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, meta_path)
+        _fsync_dir(symbol_dir)
+
+    @contextmanager
+    def _writer_lock(self, symbol: str):
+        """Exclusive per-symbol writer lock; readers never take it"""
+        lock_path = os.path.join(self._symbol_dir(symbol), self.LOCK_FILE)
+        with open(lock_path, 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(self, symbol: str, timestamps: np.ndarray, values: np.ndarray) -> int:
+        """
+        Append bars for a symbol
+
+        Args:
+            timestamps: Bar timestamps, strictly increasing and newer than
+                        the last stored bar
+            values: Bar values in column order, shape (n, len(columns))
+
+        Returns the new committed length.
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]').astype(np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.columns))
+        if len(timestamps) != len(values):
+            raise ValueError("timestamps and values must have the same length")
+
+        os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+
+        with self._writer_lock(symbol):
+            length = self.length(symbol)
+            if len(timestamps) == 0:
+                return length
+
+            if np.any(np.diff(timestamps) <= 0):
+                raise ValueError("Bar timestamps must be strictly increasing")
+            if length:
+                last_timestamp = self._open_column(symbol, self.TIMESTAMP_COLUMN, length)[-1]
+                if timestamps[0] <= last_timestamp:
+                    raise ValueError(f"Bars for {symbol} must be newer than the last stored bar")
+
+            columns = [(self.TIMESTAMP_COLUMN, timestamps)]
+            columns += [(column, values[:, i]) for i, column in enumerate(self.columns)]
+
+            for column, data in columns:
+                dtype = self._dtype(column)
+                with open(self._column_path(symbol, column), 'ab') as f:
+                    # Drop any tail left behind by an interrupted append
+                    f.truncate(length * dtype.itemsize)
+                    f.write(np.ascontiguousarray(data, dtype=dtype).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            new_length = length + len(timestamps)
+            self._write_meta(symbol, new_length)
+
+        self.logger.debug(f"Appended {len(timestamps)} bars to {symbol} ({new_length} total)")
+        return new_length
+
+    def append_frame(self, symbol: str, df: pd.DataFrame) -> int:
+        """Append an OHLCV DataFrame indexed by timestamp"""
+        return self.append(symbol, df.index.to_numpy(), df[self.columns].to_numpy())
+
+    def _open_column(self, symbol: str, column: str, length: int) -> np.ndarray:
+        if length == 0:
+            return np.empty(0, dtype=self._dtype(column))
+        return np.memmap(self._column_path(symbol, column), dtype=self._dtype(column),
+                         mode='r', shape=(length,))
+
+    def _open(self, symbol: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        length = self.length(symbol)
+        timestamps = self._open_column(symbol, self.TIMESTAMP_COLUMN, length)
+        columns = {column: self._open_column(symbol, column, length) for column in self.columns}
+        return timestamps, columns
+
+    def read(self, symbol: str, start=None, end=None, last: int = None) -> Dict[str, np.ndarray]:
+        """
+        Read bars as read-only memory-mapped slices without copying
+
+        Args:
+            start: Inclusive lower timestamp bound
+            end: Inclusive upper timestamp bound
+            last: Keep only the newest `last` bars of the range
+
+        Returns a dict with a datetime64 'timestamp' array and one array per column.
+        """
+        timestamps, columns = self._open(symbol)
+
+        lo = 0 if start is None else int(np.searchsorted(timestamps, _to_ns(start), side='left'))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, _to_ns(end), side='right'))
+        if last is not None:
+            lo = max(lo, hi - last)
+
+        result = {self.TIMESTAMP_COLUMN: timestamps[lo:hi].view('datetime64[ns]')}
+        result.update({column: data[lo:hi] for column, data in columns.items()})
+        return result
+
+    def read_frame(self, symbol: str, start=None, end=None, last: int = None) -> pd.DataFrame:
+        """
+        Read bars as a DataFrame indexed by timestamp
+        pandas may consolidate the columns into one block; use read() when
+        the bars must stay zero-copy.
+        """
+        arrays = self.read(symbol, start=start, end=end, last=last)
+        index = pd.DatetimeIndex(arrays.pop(self.TIMESTAMP_COLUMN), name='timestamp')
+        return pd.DataFrame(arrays, index=index, columns=self.columns, copy=False)
+
+
+def _to_ns(value) -> np.int64:
+    return np.int64(pd.Timestamp(value).value)
+
+
+def _fsync_dir(path: str):
+    """Persist a rename by syncing the containing directory where supported"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,249 @@
+"""
+Configuration Module
+Shared, typed and hot-reloadable access to config.json
+"""
+
+import json
+import os
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class TradingSettings:
+    """Parsed `trading` section"""
+    symbols: Tuple[str, ...] = ('BTCUSD',)
+    timeframe: str = '1h'
+    timeframes: Tuple[str, ...] = ()
+    signal_threshold: float = 70.0
+    max_signals_per_hour: int = 5
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TradingSettings':
+        return cls(
+            symbols=tuple(str(s) for s in data.get('symbols', cls.symbols)),
+            timeframe=str(data.get('timeframe', cls.timeframe)),
+            timeframes=tuple(str(tf) for tf in data.get('timeframes', cls.timeframes)),
+            signal_threshold=float(data.get('signal_threshold', cls.signal_threshold)),
+            max_signals_per_hour=int(data.get('max_signals_per_hour', cls.max_signals_per_hour))
+        )
+
+
+@dataclass(frozen=True)
+class IndicatorSettings:
+    """Parsed `indicators` section"""
+    sma_periods: Tuple[int, ...] = (20, 50)
+    rsi_period: int = 14
+    rsi_oversold: float = 30.0
+    rsi_overbought: float = 70.0
+    panel_mode: bool = False
+    extra: Tuple[str, ...] = ()
+    atr_period: int = 14
+    adx_period: int = 14
+    vwap_period: Optional[int] = None
+    keltner_period: int = 20
+    keltner_atr_period: int = 10
+    keltner_multiplier: float = 2.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'IndicatorSettings':
+        vwap_period = data.get('vwap_period', cls.vwap_period)
+        return cls(
+            sma_periods=tuple(int(p) for p in data.get('sma_periods', cls.sma_periods)),
+            rsi_period=int(data.get('rsi_period', cls.rsi_period)),
+            rsi_oversold=float(data.get('rsi_oversold', cls.rsi_oversold)),
+            rsi_overbought=float(data.get('rsi_overbought', cls.rsi_overbought)),
+            panel_mode=bool(data.get('panel_mode', cls.panel_mode)),
+            extra=tuple(str(name) for name in data.get('extra', cls.extra)),
+            atr_period=int(data.get('atr_period', cls.atr_period)),
+            adx_period=int(data.get('adx_period', cls.adx_period)),
+            vwap_period=None if vwap_period is None else int(vwap_period),
+            keltner_period=int(data.get('keltner_period', cls.keltner_period)),
+            keltner_atr_period=int(data.get('keltner_atr_period', cls.keltner_atr_period)),
+            keltner_multiplier=float(data.get('keltner_multiplier', cls.keltner_multiplier))
+        )
+
+
+@dataclass(frozen=True)
+class NotificationSettings:
+    """Parsed `notifications` section"""
+    telegram_enabled: bool = True
+    whatsapp_enabled: bool = True
+    min_confidence: float = 65.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'NotificationSettings':
+        return cls(
+            telegram_enabled=bool(data.get('telegram_enabled', cls.telegram_enabled)),
+            whatsapp_enabled=bool(data.get('whatsapp_enabled', cls.whatsapp_enabled)),
+            min_confidence=float(data.get('min_confidence', cls.min_confidence))
+        )
+
+
+@dataclass(frozen=True)
+class CooldownSettings:
+    """Parsed `signals.cooldown` section"""
+    seconds: float = 14400.0
+    max_entries: int = 10000
+    state_file: Optional[str] = 'signal_cooldown.json'
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CooldownSettings':
+        return cls(
+            seconds=float(data.get('seconds', cls.seconds)),
+            max_entries=int(data.get('max_entries', cls.max_entries)),
+            state_file=data.get('state_file', cls.state_file)
+        )
+
+
+@dataclass(frozen=True)
+class RateLimitSettings:
+    """Parsed `signals.rate_limit` section"""
+    window_seconds: float = 3600.0
+    state_file: Optional[str] = 'signal_rate.json'
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'RateLimitSettings':
+        return cls(
+            window_seconds=float(data.get('window_seconds', cls.window_seconds)),
+            state_file=data.get('state_file', cls.state_file)
+        )
+
+
+@dataclass(frozen=True)
+class SignalSettings:
+    """Parsed `signals` section"""
+    rules: Tuple[str, ...] = ('rsi', 'ma_crossover', 'macd', 'bollinger')
+    definitions: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    cooldown: CooldownSettings = CooldownSettings()
+    rate_limit: RateLimitSettings = RateLimitSettings()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SignalSettings':
+        return cls(
+            rules=tuple(str(rule) for rule in data.get('rules', cls.rules)),
+            definitions=dict(data.get('definitions', {})),
+            cooldown=CooldownSettings.from_dict(data.get('cooldown', {})),
+            rate_limit=RateLimitSettings.from_dict(data.get('rate_limit', {}))
+        )
+
+
+class AppConfig:
+    """
+    Configuration loaded once from config.json and shared by all services
+
+    The `trading`, `indicators`, `notifications` and `signals` sections are parsed into
+    frozen dataclasses so hot code reads plain attributes. The raw dict stays
+    available through get() and `raw` for sections without a typed view.
+    reload() swaps in freshly parsed settings, keeping the previous ones if
+    the file is missing or invalid; start_watching() polls the file's mtime
+    in a daemon thread so edits apply without restarting the bot.
+    """
+
+    def __init__(self, path: str = 'config.json'):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.raw: Dict[str, Any] = {}
+        self.trading = TradingSettings()
+        self.indicators = IndicatorSettings()
+        self.notifications = NotificationSettings()
+        self.signals = SignalSettings()
+        self._mtime = None
+        self._listeners: List[Callable[['AppConfig'], None]] = []
+        self._watcher: threading.Thread = None
+        self._stop_watching = threading.Event()
+        self.reload()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access to a raw top-level section"""
+        return self.raw.get(key, default)
+
+    def reload(self) -> bool:
+        """
+        Re-read the file and apply it
+        Returns True if new settings were applied, False otherwise
+        """
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            self.logger.error(f"Error loading config: {str(e)}")
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                raw = json.load(f)
+
+            trading = TradingSettings.from_dict(raw.get('trading', {}))
+            indicators = IndicatorSettings.from_dict(raw.get('indicators', {}))
+            notifications = NotificationSettings.from_dict(raw.get('notifications', {}))
+            signals = SignalSettings.from_dict(raw.get('signals', {}))
+        except Exception as e:
+            self.logger.error(f"Error loading config: {str(e)}")
+            # Do not retry the same broken revision on every poll
+            self._mtime = mtime
+            return False
+
+        self.raw = raw
+        self.trading = trading
+        self.indicators = indicators
+        self.notifications = notifications
+        self.signals = signals
+        self._mtime = mtime
+
+        for listener in self._listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                self.logger.error(f"Error in config listener: {str(e)}")
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """Reload when the file's modification time changed"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+
+        applied = self.reload()
+        if applied:
+            self.logger.info(f"Configuration reloaded from {self.path}")
+        return applied
+
+    def add_listener(self, listener: Callable[['AppConfig'], None]):
+        """Register a callback run after every successful reload"""
+        self._listeners.append(listener)
+
+    def start_watching(self, interval_seconds: float = 5.0):
+        """Poll the config file in a background thread and reload on change"""
+        if self._watcher and self._watcher.is_alive():
+            return
+
+        self._stop_watching.clear()
+
+        def watch():
+            while not self._stop_watching.wait(interval_seconds):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch, name='config-watcher', daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        """Stop the background watcher"""
+        self._stop_watching.set()
+
+
+_configs: Dict[str, AppConfig] = {}
+_configs_lock = threading.Lock()
+
+
+def get_config(path: str = 'config.json') -> AppConfig:
+    """Return the shared AppConfig for a config file, loading it on first use"""
+    key = os.path.abspath(path)
+    with _configs_lock:
+        if key not in _configs:
+            _configs[key] = AppConfig(path)
+        return _configs[key]
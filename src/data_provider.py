@@ -3,41 +3,95 @@ Data Provider Module
 Handles market data fetching and processing
 """
 
-import json
-import random
+import math
+import time
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Tuple
 import pandas as pd
 
+from .config import get_config
+from .market_data_sources import create_source
+from .market_simulator import get_base_price
+from .resampler import TimeframeResampler
+
 
 class DataProvider:
     """Provides market data for analysis"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.config = self._load_config()
+        self.config = get_config()
+        self.source = create_source(self.config)
+        self.fetch_timings: Dict[str, float] = {}
+        
+        self.timeframe = self.config.trading.timeframe
+        self.base_timeframe = self.config.get('data', {}).get('base_timeframe') or self.timeframe
+        self.timeframes = list(dict.fromkeys((self.timeframe,) + self.config.trading.timeframes))
+        self._resampled_timeframes = [tf for tf in self.timeframes if tf != self.base_timeframe]
+        self._resamplers: Dict[str, TimeframeResampler] = {}
+        self._base_frames: Dict[str, pd.DataFrame] = {}
+        # Fetches abandoned after a timeout that may still be running
+        self._in_flight: Dict[str, Future] = {}
         
-    def _load_config(self) -> Dict:
-        """Load configuration from config.json"""
-        try:
-            with open('config.json', 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.error(f"Error loading config: {str(e)}")
-            return {}
-    
     def get_market_data(self) -> Dict[str, pd.DataFrame]:
         """
         Get market data for configured symbols
         Returns dict with symbol as key and DataFrame as value
+        
+        With data.fetch.mode set to "threads", symbols are fetched
+        concurrently; see _fetch_concurrent. Per-symbol fetch durations of
+        the last run are kept in self.fetch_timings.
+        
+        The frames may be views of the source's ring buffers and are only
+        valid until the next call, which can overwrite their values in
+        place; copy them (or use get_timeframe_data) to keep bars longer.
         """
+        symbols = list(self.config.trading.symbols)
+        fetch_config = self.config.get('data', {}).get('fetch', {})
+        self.fetch_timings = {}
+        
+        # A symbol whose timed-out fetch has not returned yet is left out
+        self._in_flight = {symbol: future for symbol, future in self._in_flight.items() if not future.done()}
+        for symbol in self._in_flight:
+            self.logger.warning(f"Skipping {symbol}: previous fetch is still running")
+        symbols = [symbol for symbol in symbols if symbol not in self._in_flight]
+        
+        run_start = time.perf_counter()
+        if fetch_config.get('mode', 'sequential') == 'threads' and len(symbols) > 1:
+            market_data = self._fetch_concurrent(
+                symbols,
+                max_workers=fetch_config.get('max_workers', 8),
+                timeout=fetch_config.get('timeout_seconds', 30.0)
+            )
+        else:
+            market_data = self._fetch_sequential(symbols)
+        
+        if self.fetch_timings:
+            slowest = max(self.fetch_timings, key=self.fetch_timings.get)
+            self.logger.info(
+                f"Fetched {len(market_data)}/{len(symbols)} symbols in "
+                f"{time.perf_counter() - run_start:.3f}s "
+                f"(slowest: {slowest} {self.fetch_timings[slowest]:.3f}s)"
+            )
+        
+        return market_data
+    
+    def _fetch_symbol(self, symbol: str) -> pd.DataFrame:
+        """Fetch one symbol and record how long it took"""
+        start = time.perf_counter()
+        try:
+            return self._generate_market_data(symbol)
+        finally:
+            self.fetch_timings[symbol] = time.perf_counter() - start
+    
+    def _fetch_sequential(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """Fetch symbols one after another"""
         market_data = {}
-        symbols = self.config.get('trading', {}).get('symbols', ['BTCUSD'])
         
         for symbol in symbols:
             try:
-                df = self._generate_market_data(symbol)
+                df = self._fetch_symbol(symbol)
                 market_data[symbol] = df
                 self.logger.debug(f"Generated data for {symbol}: {len(df)} records")
             except Exception as e:
@@ -45,64 +99,120 @@ class DataProvider:
                 
         return market_data
     
+    def _fetch_concurrent(self, symbols: List[str], max_workers: int, timeout: float) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch symbols on a bounded thread pool
+        
+        At most max_workers fetches run at once. Each symbol gets `timeout`
+        seconds from the moment its fetch starts; a symbol that runs over is
+        logged and left out of the result without delaying the others.
+        
+        Workers only call source.get_bars(); the base frames and resamplers
+        are updated here, in the calling thread, for fetches that finished
+        in time. Python threads cannot be killed, so an overrunning fetch
+        keeps its worker until it returns, the pool is abandoned rather than
+        joined and the late result is discarded. Until it returns, its
+        symbol is not fetched again.
+        """
+        market_data = {}
+        started: Dict[str, float] = {}
+        
+        def fetch(symbol: str) -> Tuple[pd.DataFrame, float]:
+            start = started[symbol] = time.perf_counter()
+            df = self.source.get_bars(symbol)
+            return df, time.perf_counter() - start
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='market-data')
+        futures = {executor.submit(fetch, symbol): symbol for symbol in symbols}
+        pending = set(futures)
+        # Upper bound for the whole run so queued symbols cannot wait forever
+        # behind fetches that never return
+        deadline = time.perf_counter() + timeout * math.ceil(len(symbols) / max_workers)
+        
+        try:
+            while pending:
+                now = time.perf_counter()
+                running = [started[futures[f]] for f in pending if futures[f] in started]
+                wait_for = min([start + timeout - now for start in running] + [deadline - now])
+                done, pending = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    symbol = futures[future]
+                    try:
+                        bars, self.fetch_timings[symbol] = future.result()
+                        df = self._apply_bars(symbol, bars)
+                        market_data[symbol] = df
+                        self.logger.debug(f"Generated data for {symbol}: {len(df)} records")
+                    except Exception as e:
+                        self.logger.error(f"Error generating data for {symbol}: {str(e)}")
+                
+                now = time.perf_counter()
+                for future in list(pending):
+                    symbol = futures[future]
+                    timed_out = symbol in started and now - started[symbol] >= timeout
+                    if timed_out or now >= deadline:
+                        pending.discard(future)
+                        if not future.cancel():
+                            self._in_flight[symbol] = future
+                        self.fetch_timings.setdefault(symbol, now - started.get(symbol, now))
+                        self.logger.error(f"Timed out fetching data for {symbol} after {timeout:.1f}s")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Keep the configured symbol order
+        return {symbol: market_data[symbol] for symbol in symbols if symbol in market_data}
+    
     def _generate_market_data(self, symbol: str) -> pd.DataFrame:
         """
-        Generate simulated market data for a symbol
-        In production, this would connect to real market data APIs
+        Get market data for a symbol from the configured source
+        Defaults to simulated data; set data.source to "file" to replay history
+        
+        Bars come from the source at data.base_timeframe. When that differs
+        from trading.timeframe (or extra trading.timeframes are configured),
+        the new base bars are fed to the symbol's resampler and the frame
+        for trading.timeframe is returned.
+        """
+        return self._apply_bars(symbol, self.source.get_bars(symbol))
+    
+    def _apply_bars(self, symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Store fetched base bars and feed them to the symbol's resampler"""
+        self._base_frames[symbol] = df
+        
+        if not self._resampled_timeframes:
+            return df
+        
+        resampler = self._resamplers.get(symbol)
+        if resampler is None:
+            resampler = TimeframeResampler(self.base_timeframe, self._resampled_timeframes, capacity=len(df) or 100)
+            self._resamplers[symbol] = resampler
+        resampler.update_frame(df)
+        
+        if self.timeframe == self.base_timeframe:
+            return df
+        return resampler.get_frame(self.timeframe)
+    
+    def get_timeframe_data(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        """
+        Bars of a configured timeframe for a symbol as of the last fetch
+        The base timeframe is returned as fetched; higher timeframes come
+        from the resampler and include the still-open bar. The frame is a
+        copy, so later fetches do not change it.
         """
-        # Generate 100 data points (last 100 hours)
-        num_points = 100
-        end_time = datetime.now()
-        start_time = end_time - timedelta(hours=num_points)
-        
-        # Create time index
-        timestamps = pd.date_range(start=start_time, end=end_time, periods=num_points)
-        
-        # Generate realistic price data with trend and volatility
-        base_price = self._get_base_price(symbol)
-        prices = []
-        current_price = base_price
-        
-        for i in range(num_points):
-            # Add trend and random volatility
-            trend = random.uniform(-0.002, 0.002)  # Small trend component
-            volatility = random.uniform(-0.02, 0.02)  # Random volatility
-            
-            current_price *= (1 + trend + volatility)
-            prices.append(current_price)
-        
-        # Generate OHLCV data
-        data = []
-        for i, (timestamp, close_price) in enumerate(zip(timestamps, prices)):
-            # Generate realistic OHLC from close price
-            volatility_range = close_price * 0.01  # 1% volatility
-            
-            high = close_price + random.uniform(0, volatility_range)
-            low = close_price - random.uniform(0, volatility_range)
-            open_price = prices[i-1] if i > 0 else close_price
-            volume = random.randint(1000, 10000)
-            
-            data.append({
-                'timestamp': timestamp,
-                'open': open_price,
-                'high': high,
-                'low': low,
-                'close': close_price,
-                'volume': volume
-            })
-        
-        df = pd.DataFrame(data)
-        df.set_index('timestamp', inplace=True)
-        
-        return df
+        if timeframe == self.base_timeframe:
+            return self._base_frames[symbol].copy()
+        return self._resamplers[symbol].get_frame(timeframe).copy()
+    
+    def get_multi_timeframe_data(self) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        Fetch market data once and return every configured timeframe
+        Returns dict of symbol -> {timeframe: DataFrame}
+        """
+        market_data = self.get_market_data()
+        return {
+            symbol: {tf: self.get_timeframe_data(symbol, tf) for tf in self.timeframes}
+            for symbol in market_data
+        }
     
     def _get_base_price(self, symbol: str) -> float:
         """Get base price for symbol"""
-        base_prices = {
-            'BTCUSD': 45000.0,
-            'ETHUSD': 3000.0,
-            'AAPL': 150.0,
-            'GOOGL': 2500.0,
-            'TSLA': 200.0
-        }
-        return base_prices.get(symbol, 100.0)
+        return get_base_price(symbol)
@@ -5,8 +5,8 @@ Handles database operations for storing signals
 
 import requests
 import logging
-import json
-from typing import Dict, Any, Optional
+
+from .signal_record import Signal
 
 class DatabaseService:
     """Service for sending signals to the web database"""
@@ -15,22 +15,13 @@ class DatabaseService:
         self.logger = logging.getLogger(__name__)
         self.base_url = base_url
         
-    def save_signal_to_database(self, signal: Dict[str, Any]) -> bool:
+    def save_signal_to_database(self, signal: Signal) -> bool:
         """
         Send signal to web application database
         Returns True if successful, False otherwise
         """
         try:
-            # Format signal data for the API
-            signal_data = {
-                'ativo': signal.get('symbol', ''),
-                'direcao': 'compra' if signal.get('action') == 'buy' else 'venda',
-                'horario': signal.get('timestamp', '')[:5] if signal.get('timestamp') else '',
-                'preco': float(signal.get('price', 0)),
-                'confianca': float(signal.get('confidence', 0)),
-                'indicadores': signal.get('indicators', []),
-                'detalhes': signal.get('details', '')
-            }
+            signal_data = signal.to_api()
             
             url = f"{self.base_url}/api/signal"
             response = requests.post(url, json=signal_data, timeout=5)
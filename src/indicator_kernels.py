@@ -0,0 +1,339 @@
+"""
+Indicator Kernels Module
+NumPy kernels that compute indicators along the last axis of 1D or 2D arrays
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _prepend_zero(a: np.ndarray) -> np.ndarray:
+    pad = np.zeros(a.shape[:-1] + (1,), dtype=a.dtype)
+    return np.concatenate([pad, a], axis=-1)
+
+
+# Prefix sums of squares are accumulated in extended precision (where the
+# platform has it) so window differences stay accurate over long series
+_ACCUMULATOR = np.longdouble
+
+
+def _window_sums(a: np.ndarray, period: int, dtype=np.float64) -> np.ndarray:
+    """Sum of each trailing window of `period` values (NaN-free input)"""
+    csum = _prepend_zero(np.cumsum(a, axis=-1, dtype=dtype))
+    out = np.full(a.shape, np.nan)
+    if period <= a.shape[-1]:
+        out[..., period - 1:] = csum[..., period:] - csum[..., :-period]
+    return out
+
+
+def _window_nans(x: np.ndarray, period: int) -> np.ndarray:
+    """Whether each trailing window contains a NaN"""
+    return _window_sums(np.isnan(x).astype(np.float64), period) > 0
+
+
+def _row_reference(x: np.ndarray) -> np.ndarray:
+    """Per-row offset used to keep prefix sums small: the first finite value"""
+    valid = ~np.isnan(x)
+    if x.shape[-1] == 0:
+        return np.zeros(x.shape[:-1] + (1,))
+    first = np.take_along_axis(x, np.argmax(valid, axis=-1)[..., None], axis=-1)
+    return np.where(valid.any(axis=-1, keepdims=True), first, 0.0)
+
+
+def rolling_mean(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Trailing mean like pandas rolling(period).mean()
+    NaN until the window is full or while it contains a NaN.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    ref = _row_reference(x)
+    out = _window_sums(np.nan_to_num(x - ref), period) / period + ref
+    out[_window_nans(x, period)] = np.nan
+    return out
+
+
+def rolling_std(x: np.ndarray, period: int, ddof: int = 1) -> np.ndarray:
+    """Trailing standard deviation like pandas rolling(period).std()"""
+    x = np.asarray(x, dtype=np.float64)
+    # Shifting by a per-row reference keeps the sum of squares well conditioned
+    centered = np.nan_to_num(x - _row_reference(x))
+    sums = _window_sums(centered, period, dtype=_ACCUMULATOR)
+    squares = _window_sums(centered * centered, period, dtype=_ACCUMULATOR)
+    var = (squares - sums * sums / period) / (period - ddof)
+    out = np.sqrt(np.maximum(var, 0.0))
+    out[_window_nans(x, period)] = np.nan
+    return out
+
+
+def rolling_min(x: np.ndarray, period: int) -> np.ndarray:
+    """Trailing minimum like pandas rolling(period).min()"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if period <= x.shape[-1]:
+        out[..., period - 1:] = sliding_window_view(x, period, axis=-1).min(axis=-1)
+    return out
+
+
+def rolling_max(x: np.ndarray, period: int) -> np.ndarray:
+    """Trailing maximum like pandas rolling(period).max()"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    if period <= x.shape[-1]:
+        out[..., period - 1:] = sliding_window_view(x, period, axis=-1).max(axis=-1)
+    return out
+
+
+def ewm_mean(x: np.ndarray, span: float = None, alpha: float = None, adjust: bool = True) -> np.ndarray:
+    """
+    Exponentially weighted mean like pandas ewm(span=span).mean()
+
+    Uses the adjusted form num_t / den_t with num_t = d*num_{t-1} + x_t and
+    den_t = d*den_{t-1} + 1, where NaN inputs add nothing but still decay.
+    Within a block the recursion is rewritten as a cumulative sum of
+    x_k * d**-k; blocks are sized so d**-k cannot overflow, which keeps the
+    whole computation vectorized apart from a short loop over blocks.
+
+    `alpha` may be given instead of `span`. adjust=False gives the
+    recursive form y_t = (1 - alpha)*y_{t-1} + alpha*x_t seeded with the
+    first value, like pandas ewm(adjust=False): every input but the first
+    is weighted by alpha. After a NaN gap pandas renormalizes the average
+    once and continues from it, while here the earlier weight keeps
+    decaying; the two agree for series that only have leading NaNs.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if alpha is None:
+        alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    valid = ~np.isnan(x)
+    values = np.where(valid, x, 0.0)
+    weights = valid.astype(np.float64)
+    if not adjust:
+        first = valid & (np.cumsum(valid, axis=-1) == 1)
+        scale = np.where(first, 1.0, alpha)
+        values *= scale
+        weights *= scale
+
+    num = np.empty_like(values)
+    den = np.empty_like(values)
+    carry_num = np.zeros(x.shape[:-1])
+    carry_den = np.zeros(x.shape[:-1])
+
+    n = x.shape[-1]
+    block = n if decay == 0 else max(1, min(n, int(300 / -np.log(decay))))
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        if decay == 0:
+            num[..., start:stop] = values[..., start:stop]
+            den[..., start:stop] = weights[..., start:stop]
+            continue
+        k = np.arange(stop - start, dtype=np.float64)
+        grow = decay ** -k
+        shrink = decay ** k
+        num[..., start:stop] = shrink * (decay * carry_num[..., None] + np.cumsum(values[..., start:stop] * grow, axis=-1))
+        den[..., start:stop] = shrink * (decay * carry_den[..., None] + np.cumsum(weights[..., start:stop] * grow, axis=-1))
+        carry_num = num[..., stop - 1]
+        carry_den = den[..., stop - 1]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def diff(x: np.ndarray) -> np.ndarray:
+    """First difference along the last axis; the first element is NaN"""
+    x = np.asarray(x, dtype=np.float64)
+    out = np.full(x.shape, np.nan)
+    out[..., 1:] = x[..., 1:] - x[..., :-1]
+    return out
+
+
+def wilder_mean(x: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothing, an ewm with alpha = 1/period and adjust=False"""
+    return ewm_mean(x, alpha=1.0 / period, adjust=False)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """max(high - low, |high - prev close|, |low - prev close|); high - low on the first bar"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    prev_close = np.full(high.shape, np.nan)
+    prev_close[..., 1:] = np.asarray(close, dtype=np.float64)[..., :-1]
+    # fmax skips the missing previous close on the first bar
+    return np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder's smoothing"""
+    return wilder_mean(true_range(high, low, close), period)
+
+
+def dmi(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> dict:
+    """
+    Directional Movement Index: 'plus_di', 'minus_di' and 'adx'
+    Directional movement and the true range are Wilder-smoothed; ADX is the
+    Wilder-smoothed DX. The first bar has no directional movement.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    # No directional movement on the first bar (or the first after a gap)
+    up = np.where(np.isnan(high), np.nan, np.nan_to_num(diff(high)))
+    down = np.where(np.isnan(low), np.nan, np.nan_to_num(-diff(low)))
+    with np.errstate(invalid='ignore'):
+        plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+        minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    plus_dm[np.isnan(up)] = np.nan
+    minus_dm[np.isnan(down)] = np.nan
+
+    smoothed_tr = atr(high, low, close, period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        plus_di = 100 * wilder_mean(plus_dm, period) / smoothed_tr
+        minus_di = 100 * wilder_mean(minus_dm, period) / smoothed_tr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return {'plus_di': plus_di, 'minus_di': minus_di, 'adx': wilder_mean(dx, period)}
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+         period: int = None) -> np.ndarray:
+    """
+    Volume-weighted average of the typical price (high + low + close) / 3
+    Cumulative from the first bar, or over a trailing window of `period` bars.
+    """
+    typical = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64)
+               + np.asarray(close, dtype=np.float64)) / 3
+    volume = np.asarray(volume, dtype=np.float64)
+    weighted = typical * volume
+    if period is None:
+        valid = ~np.isnan(weighted)
+        price_volume = np.cumsum(np.where(valid, weighted, 0.0), axis=-1)
+        total_volume = np.cumsum(np.where(valid, volume, 0.0), axis=-1)
+        price_volume[~valid] = np.nan
+    else:
+        price_volume = _window_sums(np.nan_to_num(weighted), period, dtype=_ACCUMULATOR)
+        total_volume = _window_sums(np.nan_to_num(volume), period, dtype=_ACCUMULATOR)
+        price_volume[_window_nans(weighted, period)] = np.nan
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return price_volume / total_volume
+
+
+def obv(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """On-Balance Volume: running sum of volume signed by the close-to-close move, 0 on the first bar"""
+    direction = np.sign(np.nan_to_num(diff(close)))
+    return np.cumsum(direction * np.nan_to_num(np.asarray(volume, dtype=np.float64)), axis=-1)
+
+
+def keltner(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 20,
+            multiplier: float = 2.0, atr_period: int = 10) -> dict:
+    """Keltner Channels: EMA(close) middle line with bands `multiplier` ATRs away"""
+    middle = ewm_mean(close, period)
+    width = multiplier * atr(high, low, close, atr_period)
+    return {'upper': middle + width, 'middle': middle, 'lower': middle - width}
+
+
+def rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI with plain rolling averages, matching TechnicalIndicators.rsi"""
+    close = np.asarray(close, dtype=np.float64)
+    delta = diff(close)
+    # pandas' where(delta > 0, 0) turns the leading NaN change into 0
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    missing = np.isnan(close)
+    gain[missing] = np.nan
+    loss[missing] = np.nan
+
+    avg_gain = rolling_mean(gain, period)
+    avg_loss = rolling_mean(loss, period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _sweep_windows(csum: np.ndarray, periods, n: int) -> np.ndarray:
+    """
+    Trailing window sums for every period from one prefix-sum array
+    Returns shape (len(periods), ..., n) with NaN where a window is not full.
+    """
+    out = np.full((len(periods),) + csum.shape[:-1] + (n,), np.nan)
+    for i, period in enumerate(periods):
+        if period <= n:
+            np.subtract(csum[..., period:], csum[..., :-period], out=out[i, ..., period - 1:])
+    return out
+
+
+def _sweep_nan_mask(x: np.ndarray, periods) -> np.ndarray:
+    """Per-period mask of windows containing a NaN, or None if x has none"""
+    missing = np.isnan(x)
+    if not missing.any():
+        return None
+    counts = _prepend_zero(np.cumsum(missing, axis=-1, dtype=np.float64))
+    return _sweep_windows(counts, periods, x.shape[-1]) > 0
+
+
+def _check_periods(periods) -> list:
+    periods = [int(p) for p in periods]
+    if any(p < 1 for p in periods):
+        raise ValueError(f"Periods must be positive: {periods}")
+    return periods
+
+
+def rolling_mean_sweep(x: np.ndarray, periods) -> np.ndarray:
+    """
+    rolling_mean for many periods at once
+    One prefix sum is shared by every period, so each extra period costs a
+    single subtraction pass. Returns shape (len(periods), ..., bars).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    periods = _check_periods(periods)
+    ref = _row_reference(x)
+    csum = _prepend_zero(np.cumsum(np.nan_to_num(x - ref), axis=-1))
+
+    out = _sweep_windows(csum, periods, x.shape[-1])
+    out /= np.asarray(periods, dtype=np.float64).reshape((-1,) + (1,) * x.ndim)
+    out += ref
+
+    mask = _sweep_nan_mask(x, periods)
+    if mask is not None:
+        out[mask] = np.nan
+    return out
+
+
+def rolling_std_sweep(x: np.ndarray, periods, ddof: int = 1) -> np.ndarray:
+    """rolling_std for many periods from one sum and one sum-of-squares pass"""
+    x = np.asarray(x, dtype=np.float64)
+    periods = _check_periods(periods)
+    centered = np.nan_to_num(x - _row_reference(x))
+    n = x.shape[-1]
+    sums = _sweep_windows(_prepend_zero(np.cumsum(centered, axis=-1, dtype=_ACCUMULATOR)), periods, n)
+    squares = _sweep_windows(_prepend_zero(np.cumsum(centered * centered, axis=-1, dtype=_ACCUMULATOR)), periods, n)
+
+    p = np.asarray(periods, dtype=np.float64).reshape((-1,) + (1,) * x.ndim)
+    # var = (squares - sums**2 / p) / (p - ddof), computed in place
+    sums *= sums
+    sums /= p
+    squares -= sums
+    with np.errstate(invalid='ignore', divide='ignore'):
+        squares /= p - ddof
+    np.maximum(squares, 0.0, out=squares)
+    np.sqrt(squares, out=squares)
+
+    mask = _sweep_nan_mask(x, periods)
+    if mask is not None:
+        squares[mask] = np.nan
+    return squares
+
+
+def rsi_sweep(close: np.ndarray, periods) -> np.ndarray:
+    """rsi for many periods from one gain and one loss prefix sum"""
+    close = np.asarray(close, dtype=np.float64)
+    delta = diff(close)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    missing = np.isnan(close)
+    gain[missing] = np.nan
+    loss[missing] = np.nan
+
+    avg_gain = rolling_mean_sweep(gain, periods)
+    avg_loss = rolling_mean_sweep(loss, periods)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_gain /= avg_loss
+    avg_gain += 1
+    np.divide(100, avg_gain, out=avg_gain)
+    np.subtract(100, avg_gain, out=avg_gain)
+    return avg_gain
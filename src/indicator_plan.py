@@ -0,0 +1,182 @@
+"""
+Indicator Plan Module
+Works out which indicator series are needed and computes shared inputs once
+"""
+
+from typing import Any, Callable, Dict, Iterable, Set, Tuple
+import numpy as np
+import pandas as pd
+
+from . import indicator_kernels as kernels
+
+
+# Optional indicator groups enabled through indicators.extra
+EXTRA_COLUMNS = {
+    'atr': ['atr'],
+    'adx': ['adx', 'plus_di', 'minus_di'],
+    'vwap': ['vwap'],
+    'obv': ['obv'],
+    'keltner': ['kc_upper', 'kc_middle', 'kc_lower'],
+}
+
+
+class IndicatorPlan:
+    """
+    Execution plan for a set of indicator output columns
+
+    Each output column is produced from named intermediate series (for
+    example ('sma', 20) or ('ema', 12)). Intermediates are memoized during
+    execute(), so the 20-period SMA is computed once for both sma_20 and
+    the Bollinger middle band, and the MACD EMAs once for all MACD columns.
+    Results are written into a single preallocated (bars x columns) block;
+    columns that were not requested are never computed.
+    """
+
+    def __init__(self, columns: Iterable[str], config: Any):
+        settings = config.indicators
+        self.sma_periods = list(settings.sma_periods)
+        self.rsi_period = settings.rsi_period
+        self.atr_period = settings.atr_period
+        self.adx_period = settings.adx_period
+        self.vwap_period = settings.vwap_period
+        self.keltner_period = settings.keltner_period
+        self.keltner_atr_period = settings.keltner_atr_period
+        self.keltner_multiplier = settings.keltner_multiplier
+        self.extra = list(settings.extra)
+
+        self._producers = self._build_producers()
+        self.columns = []
+        for column in columns:
+            if column not in self._producers:
+                raise ValueError(f"Unknown indicator column: {column}")
+            if column not in self.columns:
+                self.columns.append(column)
+
+    @property
+    def available_columns(self) -> Set[str]:
+        """Every output column this plan can produce"""
+        return set(self._producers)
+
+    @classmethod
+    def for_all(cls, config: Any) -> 'IndicatorPlan':
+        """
+        Plan producing every column of calculate_all_indicators: the core
+        indicators plus the groups listed in indicators.extra
+        """
+        plan = cls([], config)
+        extra_columns = {column for columns in EXTRA_COLUMNS.values() for column in columns}
+        columns = [column for column in plan._producers if column not in extra_columns]
+        for group in plan.extra:
+            if group not in EXTRA_COLUMNS:
+                raise ValueError(f"Unknown indicator: {group}")
+            columns.extend(EXTRA_COLUMNS[group])
+        return cls(columns, config)
+
+    def _build_producers(self) -> Dict[str, Callable]:
+        """Map every supported output column to a function of the memoized inputs"""
+        producers = {}
+
+        for period in self.sma_periods:
+            producers[f'sma_{period}'] = lambda get, p=period: get('sma', p)
+
+        producers['rsi'] = lambda get: get('rsi', self.rsi_period)
+
+        producers['macd'] = lambda get: get('macd')
+        producers['macd_signal'] = lambda get: get('macd_signal')
+        producers['macd_histogram'] = lambda get: get('macd') - get('macd_signal')
+
+        producers['bb_upper'] = lambda get: get('sma', 20) + get('std', 20) * 2
+        producers['bb_middle'] = lambda get: get('sma', 20)
+        producers['bb_lower'] = lambda get: get('sma', 20) - get('std', 20) * 2
+
+        producers['stoch_k'] = lambda get: get('stoch_k')
+        producers['stoch_d'] = lambda get: kernels.rolling_mean(get('stoch_k'), 3)
+
+        producers['atr'] = lambda get: get('atr', self.atr_period)
+        producers['adx'] = lambda get: get('dmi', self.adx_period)['adx']
+        producers['plus_di'] = lambda get: get('dmi', self.adx_period)['plus_di']
+        producers['minus_di'] = lambda get: get('dmi', self.adx_period)['minus_di']
+        producers['vwap'] = lambda get: get('vwap')
+        producers['obv'] = lambda get: get('obv')
+
+        keltner_width = lambda get: get('atr', self.keltner_atr_period) * self.keltner_multiplier
+        producers['kc_upper'] = lambda get: get('ema', self.keltner_period) + keltner_width(get)
+        producers['kc_middle'] = lambda get: get('ema', self.keltner_period)
+        producers['kc_lower'] = lambda get: get('ema', self.keltner_period) - keltner_width(get)
+
+        return producers
+
+    def _intermediate(self, key: Tuple, inputs: Dict[str, np.ndarray], get: Callable) -> np.ndarray:
+        kind = key[0]
+        close = inputs['close']
+
+        if kind == 'sma':
+            return kernels.rolling_mean(close, key[1])
+        if kind == 'std':
+            return kernels.rolling_std(close, key[1])
+        if kind == 'ema':
+            return kernels.ewm_mean(close, key[1])
+        if kind == 'rsi':
+            return kernels.rsi(close, key[1])
+        if kind == 'macd':
+            return get('ema', 12) - get('ema', 26)
+        if kind == 'macd_signal':
+            return kernels.ewm_mean(get('macd'), 9)
+        if kind == 'stoch_k':
+            lowest_low = kernels.rolling_min(inputs['low'], 14)
+            highest_high = kernels.rolling_max(inputs['high'], 14)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return 100 * ((close - lowest_low) / (highest_high - lowest_low))
+        if kind == 'true_range':
+            return kernels.true_range(inputs['high'], inputs['low'], close)
+        if kind == 'atr':
+            return kernels.wilder_mean(get('true_range'), key[1])
+        if kind == 'dmi':
+            return kernels.dmi(inputs['high'], inputs['low'], close, key[1])
+        if kind == 'vwap':
+            return kernels.vwap(inputs['high'], inputs['low'], close, inputs['volume'], self.vwap_period)
+        if kind == 'obv':
+            return kernels.obv(close, inputs['volume'])
+        raise ValueError(f"Unknown intermediate: {key}")
+
+    def execute(self, inputs: Dict[str, np.ndarray], out: np.ndarray = None) -> np.ndarray:
+        """
+        Compute the planned columns
+
+        Args:
+            inputs: 'open', 'high', 'low', 'close', 'volume' arrays of shape (..., bars)
+            out: Optional preallocated array of shape (..., bars, len(columns))
+
+        Returns the output block with one column per planned indicator.
+        """
+        shape = np.shape(inputs['close'])
+        if out is None:
+            out = np.empty(shape + (len(self.columns),))
+
+        cache: Dict[Tuple, np.ndarray] = {}
+
+        def get(*key) -> np.ndarray:
+            if key not in cache:
+                cache[key] = self._intermediate(key, inputs, get)
+            return cache[key]
+
+        for i, column in enumerate(self.columns):
+            out[..., i] = self._producers[column](get)
+
+        return out
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Return df with the planned indicator columns added
+        The input columns and the indicators are written into one block and
+        wrapped in a single DataFrame instead of inserted one at a time.
+        """
+        base_columns = list(df.columns)
+        block = np.empty((len(df), len(base_columns) + len(self.columns)))
+        block[:, :len(base_columns)] = df.to_numpy(dtype=np.float64)
+
+        inputs = {col: block[:, base_columns.index(col)]
+                  for col in ('high', 'low', 'close', 'volume') if col in base_columns}
+        self.execute(inputs, out=block[:, len(base_columns):])
+
+        return pd.DataFrame(block, index=df.index, columns=base_columns + self.columns, copy=False)
@@ -0,0 +1,276 @@
+"""
+Market Data Sources Module
+Pluggable OHLCV sources used by DataProvider
+"""
+
+import os
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+import pandas as pd
+
+from .bar_buffer import BarRingBuffer
+from .bar_store import BarStore
+from .market_simulator import MarketSimulator, OHLCV_COLUMNS
+from .resampler import parse_timeframe
+
+
+class MarketDataSource(ABC):
+    """Base class for market data sources"""
+
+    name = 'base'
+
+    @abstractmethod
+    def get_bars(self, symbol: str) -> pd.DataFrame:
+        """Return the current OHLCV window for a symbol, indexed by timestamp"""
+
+
+class SimulatedSource(MarketDataSource):
+    """
+    Random-walk bars from MarketSimulator
+    Bars are kept in a per-symbol ring buffer; each call only simulates the
+    bars that closed since the previous call and returns the window as a
+    frame backed by the buffer memory.
+    """
+
+    name = 'simulated'
+
+    def __init__(self, config: Dict):
+        self.simulator = MarketSimulator.from_config(config)
+        self.num_bars = config.get('data', {}).get('simulation', {}).get('bars', 100)
+        base_timeframe = config.get('data', {}).get('base_timeframe') or config.get('trading', {}).get('timeframe', '1h')
+        self.bar_interval = parse_timeframe(base_timeframe)
+        self._buffers: Dict[str, BarRingBuffer] = {}
+
+    def get_bars(self, symbol: str) -> pd.DataFrame:
+        now = np.datetime64(datetime.now(), 'ns')
+        interval = self.bar_interval.to_timedelta64()
+        buffer = self._buffers.get(symbol)
+
+        if buffer is None:
+            buffer = BarRingBuffer(self.num_bars)
+            values = self.simulator.generate_bars(symbol, self.num_bars)
+            timestamps = now - interval * np.arange(self.num_bars - 1, -1, -1)
+            buffer.append(timestamps, values)
+            self._buffers[symbol] = buffer
+            return buffer.to_frame()
+
+        last_timestamp = buffer.last_timestamp.to_datetime64()
+        elapsed_bars = int((now - last_timestamp) // interval)
+        if elapsed_bars > 0:
+            # Bars older than the window would be overwritten immediately
+            new_bars = min(elapsed_bars, buffer.capacity)
+            last_close = buffer.last('close')
+            values = self.simulator.generate_bars(
+                symbol, new_bars, start_price=last_close, prev_close=last_close
+            )
+            steps = np.arange(elapsed_bars - new_bars + 1, elapsed_bars + 1)
+            buffer.append(last_timestamp + interval * steps, values)
+
+        return buffer.to_frame()
+
+
+class FileReplaySource(MarketDataSource):
+    """
+    Historical OHLCV replayed from CSV or Parquet files
+
+    Files are read in chunks and only the timestamp and OHLCV columns are
+    loaded. Rows outside [start, end] are dropped chunk by chunk and reading
+    stops at the first chunk past `end`, so files are expected to be sorted
+    by timestamp; Parquet row groups whose timestamp statistics fall outside
+    [start, end] are not read at all.
+
+    get_bars() replays the file: the first call returns the first `num_bars`
+    bars, and every later call moves the window forward by `step_bars`,
+    reading only those bars from the symbol's open chunk stream. Once the
+    file is exhausted the last window keeps being returned.
+    """
+
+    name = 'file'
+
+    def __init__(self,
+                 path: str,
+                 file_format: str = None,
+                 num_bars: int = 100,
+                 start: str = None,
+                 end: str = None,
+                 chunk_size: int = 100_000,
+                 timestamp_column: str = 'timestamp',
+                 step_bars: int = 1):
+        self.path = path
+        self.file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+        if self.file_format not in ('csv', 'parquet'):
+            raise ValueError(f"Unsupported replay file format: {self.file_format}")
+
+        self.num_bars = num_bars
+        self.start = pd.Timestamp(start) if start else None
+        self.end = pd.Timestamp(end) if end else None
+        self.chunk_size = chunk_size
+        self.timestamp_column = timestamp_column
+        self.step_bars = step_bars
+        self._cursors: Dict[str, _ReplayCursor] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'FileReplaySource':
+        """Create a replay source from the data.replay section of config.json"""
+        data_config = config.get('data', {})
+        replay_config = data_config.get('replay', {})
+        return cls(
+            path=replay_config.get('path', 'data/{symbol}.csv'),
+            file_format=replay_config.get('format'),
+            num_bars=data_config.get('simulation', {}).get('bars', 100),
+            start=replay_config.get('start'),
+            end=replay_config.get('end'),
+            chunk_size=replay_config.get('chunk_size', 100_000),
+            timestamp_column=replay_config.get('timestamp_column', 'timestamp'),
+            step_bars=replay_config.get('step_bars', 1)
+        )
+
+    def _file_for(self, symbol: str) -> str:
+        return self.path.format(symbol=symbol)
+
+    def _read_csv(self, path: str) -> Iterator[pd.DataFrame]:
+        columns = [self.timestamp_column] + OHLCV_COLUMNS
+        reader = pd.read_csv(path, usecols=columns, chunksize=self.chunk_size)
+        with reader:
+            yield from reader
+
+    def _read_parquet(self, path: str) -> Iterator[pd.DataFrame]:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet replay requires pyarrow (pip install pyarrow)")
+
+        columns = [self.timestamp_column] + OHLCV_COLUMNS
+        parquet_file = pq.ParquetFile(path)
+        row_groups = self._parquet_row_groups(parquet_file)
+        if not row_groups:
+            return
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size, columns=columns, row_groups=row_groups):
+            yield batch.to_pandas()
+
+    def _parquet_row_groups(self, parquet_file) -> List[int]:
+        """Row groups whose timestamp statistics overlap [start, end] (all of them without statistics)"""
+        metadata = parquet_file.metadata
+        groups = list(range(metadata.num_row_groups))
+        if self.start is None and self.end is None:
+            return groups
+
+        column = parquet_file.schema_arrow.get_field_index(self.timestamp_column)
+        selected = []
+        for group in groups:
+            statistics = metadata.row_group(group).column(column).statistics
+            try:
+                if statistics is not None and statistics.has_min_max:
+                    if self.start is not None and pd.Timestamp(statistics.max) < self.start:
+                        continue
+                    if self.end is not None and pd.Timestamp(statistics.min) > self.end:
+                        continue
+            except (TypeError, ValueError):
+                # Statistics not comparable with the range; read the group
+                pass
+            selected.append(group)
+        return selected
+
+    def iter_chunks(self, symbol: str) -> Iterator[pd.DataFrame]:
+        """
+        Stream the symbol's history in chunks restricted to [start, end]
+        Each chunk is an OHLCV frame indexed by timestamp.
+        """
+        path = self._file_for(symbol)
+        reader = self._read_parquet(path) if self.file_format == 'parquet' else self._read_csv(path)
+
+        for chunk in reader:
+            timestamps = pd.to_datetime(chunk[self.timestamp_column])
+            mask = np.ones(len(chunk), dtype=bool)
+            if self.start is not None:
+                mask &= (timestamps >= self.start).to_numpy()
+            if self.end is not None:
+                mask &= (timestamps <= self.end).to_numpy()
+
+            if mask.any():
+                frame = chunk.loc[mask, OHLCV_COLUMNS].astype(np.float64)
+                frame.index = pd.DatetimeIndex(timestamps[mask], name='timestamp')
+                yield frame
+
+            if self.end is not None and len(timestamps) and timestamps.iloc[-1] > self.end:
+                break
+
+    def get_bars(self, symbol: str) -> pd.DataFrame:
+        cursor = self._cursors.get(symbol)
+        if cursor is None:
+            cursor = self._cursors[symbol] = _ReplayCursor(self.iter_chunks(symbol), self.num_bars)
+            count = self.num_bars
+        else:
+            count = self.step_bars
+
+        timestamps, values = cursor.read(count)
+        cursor.buffer.append(timestamps, values)
+        return cursor.buffer.to_frame()
+
+
+class _ReplayCursor:
+    """Replay position of one symbol: its chunk stream, the unread rows of the current chunk and the window"""
+
+    def __init__(self, chunks: Iterator[pd.DataFrame], num_bars: int):
+        self.chunks = chunks
+        self.buffer = BarRingBuffer(num_bars)
+        self.timestamps = np.empty(0, dtype='datetime64[ns]')
+        self.values = np.empty((0, len(OHLCV_COLUMNS)))
+        self.offset = 0
+
+    def read(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """The next `count` bars (fewer at the end of the file)"""
+        timestamps, values = [], []
+        while count > 0:
+            if self.offset >= len(self.timestamps):
+                chunk = next(self.chunks, None)
+                if chunk is None:
+                    break
+                self.timestamps = chunk.index.to_numpy(dtype='datetime64[ns]')
+                self.values = chunk.to_numpy(dtype=np.float64)
+                self.offset = 0
+                continue
+            stop = min(self.offset + count, len(self.timestamps))
+            timestamps.append(self.timestamps[self.offset:stop])
+            values.append(self.values[self.offset:stop])
+            count -= stop - self.offset
+            self.offset = stop
+
+        if not timestamps:
+            return self.timestamps[:0], self.values[:0]
+        return np.concatenate(timestamps), np.concatenate(values)
+
+
+class StoreSource(MarketDataSource):
+    """
+    Bars read from a memory-mapped BarStore
+    The window is the last `num_bars` committed bars of each symbol, found
+    by slicing the mapped columns without loading the full history.
+    """
+
+    name = 'store'
+
+    def __init__(self, config: Dict):
+        data_config = config.get('data', {})
+        self.store = BarStore(data_config.get('store', {}).get('path', 'data/store'))
+        self.num_bars = data_config.get('simulation', {}).get('bars', 100)
+
+    def get_bars(self, symbol: str) -> pd.DataFrame:
+        return self.store.read_frame(symbol, last=self.num_bars)
+
+
+SOURCES = {
+    SimulatedSource.name: SimulatedSource,
+    FileReplaySource.name: FileReplaySource.from_config,
+    StoreSource.name: StoreSource
+}
+
+
+def create_source(config: Dict) -> MarketDataSource:
+    """Create the market data source selected by data.source in config.json"""
+    source_name = config.get('data', {}).get('source', 'simulated')
+    if source_name not in SOURCES:
+        raise ValueError(f"Unknown market data source: {source_name}")
+    return SOURCES[source_name](config)
@@ -0,0 +1,171 @@
+"""
+Market Simulator Module
+Vectorized synthetic OHLCV generation based on NumPy random generators
+"""
+
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+VOLATILITY_MODELS = ('uniform', 'normal')
+
+BASE_PRICES = {
+    'BTCUSD': 45000.0,
+    'ETHUSD': 3000.0,
+    'AAPL': 150.0,
+    'GOOGL': 2500.0,
+    'TSLA': 200.0
+}
+
+
+class MarketSimulator:
+    """
+    Random-walk OHLCV generator
+
+    Every bar's close is the previous close scaled by (1 + trend + shock),
+    high/low are drawn within a fixed percentage of the close, the open is
+    the previous close and volume is a uniform integer. All bars of one or
+    many symbols are produced with whole-array NumPy operations.
+    """
+
+    def __init__(self,
+                 seed: Optional[int] = None,
+                 volatility_model: str = 'uniform',
+                 trend: float = 0.002,
+                 volatility: float = 0.02,
+                 range_pct: float = 0.01,
+                 volume_range: tuple = (1000, 10000)):
+        if volatility_model not in VOLATILITY_MODELS:
+            raise ValueError(f"Unknown volatility model: {volatility_model}")
+
+        self.seed = seed
+        self.volatility_model = volatility_model
+        self.trend = trend
+        self.volatility = volatility
+        self.range_pct = range_pct
+        self.volume_range = volume_range
+        self._rng = np.random.default_rng(seed)
+        self._symbol_rngs: Dict[str, np.random.Generator] = {}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'MarketSimulator':
+        """Create a simulator from the data.simulation section of config.json"""
+        sim_config = config.get('data', {}).get('simulation', {})
+        return cls(
+            seed=sim_config.get('seed'),
+            volatility_model=sim_config.get('volatility_model', 'uniform'),
+            trend=sim_config.get('trend', 0.002),
+            volatility=sim_config.get('volatility', 0.02),
+            range_pct=sim_config.get('range_pct', 0.01)
+        )
+
+    def _symbol_rng(self, symbol: str) -> np.random.Generator:
+        """
+        Random generator for a single symbol
+        With a seed, every symbol gets its own reproducible stream so results
+        do not depend on the order in which symbols are requested.
+        """
+        if self.seed is None:
+            return self._rng
+        if symbol not in self._symbol_rngs:
+            self._symbol_rngs[symbol] = np.random.default_rng([self.seed, zlib.crc32(symbol.encode())])
+        return self._symbol_rngs[symbol]
+
+    def _returns(self, rng: np.random.Generator, shape: tuple) -> np.ndarray:
+        """Per-bar multiplicative returns (trend + shock) for the volatility model"""
+        trend = rng.uniform(-self.trend, self.trend, size=shape)
+        if self.volatility_model == 'normal':
+            # Same standard deviation as the uniform shock
+            shock = rng.normal(0.0, self.volatility / np.sqrt(3.0), size=shape)
+        else:
+            shock = rng.uniform(-self.volatility, self.volatility, size=shape)
+        return 1.0 + trend + shock
+
+    def generate_arrays(self,
+                        base_prices: np.ndarray,
+                        num_bars: int,
+                        rng: np.random.Generator = None,
+                        prev_close: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """
+        Generate OHLCV arrays of shape (symbols, num_bars)
+
+        Args:
+            base_prices: Starting price for every symbol
+            num_bars: Number of bars per symbol
+            rng: Random generator (defaults to the simulator's own)
+            prev_close: Close preceding the first bar, used as its open.
+                        Defaults to the first close itself.
+        """
+        rng = rng or self._rng
+        base_prices = np.asarray(base_prices, dtype=np.float64).reshape(-1, 1)
+        shape = (base_prices.shape[0], num_bars)
+
+        close = base_prices * np.cumprod(self._returns(rng, shape), axis=1)
+
+        spread = close * self.range_pct
+        high = close + rng.uniform(0.0, 1.0, size=shape) * spread
+        low = close - rng.uniform(0.0, 1.0, size=shape) * spread
+
+        open_ = np.empty_like(close)
+        open_[:, 1:] = close[:, :-1]
+        open_[:, 0] = close[:, 0] if prev_close is None else np.asarray(prev_close, dtype=np.float64)
+
+        low_vol, high_vol = self.volume_range
+        volume = rng.integers(low_vol, high_vol, size=shape, endpoint=True).astype(np.float64)
+
+        return {
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume
+        }
+
+    def generate_batch(self, symbols: List[str], num_bars: int) -> Dict[str, np.ndarray]:
+        """Generate OHLCV arrays of shape (len(symbols), num_bars) in one pass"""
+        base_prices = np.array([get_base_price(s) for s in symbols], dtype=np.float64)
+        return self.generate_arrays(base_prices, num_bars)
+
+    def generate_bars(self,
+                      symbol: str,
+                      num_bars: int,
+                      start_price: float = None,
+                      prev_close: float = None) -> np.ndarray:
+        """
+        Generate num_bars bars for one symbol as an array of shape (num_bars, 5)
+        Columns follow OHLCV_COLUMNS. Pass the last known close as start_price
+        and prev_close to continue an existing series.
+        """
+        start_price = get_base_price(symbol) if start_price is None else start_price
+        arrays = self.generate_arrays(
+            np.array([start_price]), num_bars, rng=self._symbol_rng(symbol),
+            prev_close=None if prev_close is None else np.array([prev_close])
+        )
+        return np.column_stack([arrays[col][0] for col in OHLCV_COLUMNS])
+
+    def generate_frame(self,
+                       symbol: str,
+                       num_bars: int = 100,
+                       end_time: datetime = None) -> pd.DataFrame:
+        """Generate a DataFrame of num_bars hourly-spaced bars ending at end_time"""
+        end_time = end_time or datetime.now()
+        start_time = end_time - timedelta(hours=num_bars)
+        timestamps = pd.date_range(start=start_time, end=end_time, periods=num_bars)
+
+        arrays = self.generate_arrays(
+            np.array([get_base_price(symbol)]), num_bars, rng=self._symbol_rng(symbol)
+        )
+
+        df = pd.DataFrame({col: arrays[col][0] for col in OHLCV_COLUMNS}, index=timestamps)
+        df.index.name = 'timestamp'
+        return df
+
+
+def get_base_price(symbol: str) -> float:
+    """Get base price for symbol"""
+    return BASE_PRICES.get(symbol, 100.0)
@@ -0,0 +1,181 @@
+"""
+Parallel Signals Module
+Process-pool symbol analysis over market data kept in shared memory
+"""
+
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from .market_simulator import OHLCV_COLUMNS
+from .signal_record import Signal
+
+# (signals, error message) per symbol, in input order
+SymbolResult = Tuple[List[Signal], Optional[str]]
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Open a segment created by the parent
+    Pool workers share the parent's resource tracker, so the parent's
+    unlink() in release() remains the only cleanup.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+class SharedMarketData:
+    """
+    OHLCV windows of many symbols packed into shared memory
+
+    Values live in one (symbols x bars x 5) float64 segment and timestamps
+    in a (symbols x bars) datetime64[ns] segment, left-aligned with the
+    per-symbol lengths alongside. A frame missing some OHLCV columns is
+    packed with only the columns it has, recorded per symbol so workers
+    rebuild the same frame. Only the segment names, shapes, lengths and
+    those column lists are pickled to workers, which rebuild zero-copy
+    DataFrames.
+    """
+
+    def __init__(self, market_data: Dict[str, pd.DataFrame]):
+        self.symbols = list(market_data)
+        self.lengths = [len(df) for df in market_data.values()]
+        self.errors: Dict[int, str] = {}
+        # Columns present per symbol; None when all of OHLCV_COLUMNS are
+        self.columns: List[Optional[List[str]]] = [None] * len(self.symbols)
+        self.shape = (len(self.symbols), max(self.lengths, default=0))
+        cells = max(1, int(np.prod(self.shape)))
+        self._values = shared_memory.SharedMemory(create=True, size=cells * 5 * 8)
+        try:
+            self._times = shared_memory.SharedMemory(create=True, size=cells * 8)
+        except Exception:
+            self._values.close()
+            self._values.unlink()
+            raise
+
+        values = np.ndarray(self.shape + (5,), dtype=np.float64, buffer=self._values.buf)
+        times = np.ndarray(self.shape, dtype='datetime64[ns]', buffer=self._times.buf)
+        for row, df in enumerate(market_data.values()):
+            try:
+                present = [column for column in OHLCV_COLUMNS if column in df.columns]
+                if len(present) == len(OHLCV_COLUMNS):
+                    values[row, :len(df)] = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+                else:
+                    positions = [OHLCV_COLUMNS.index(column) for column in present]
+                    values[row][:len(df), positions] = df[present].to_numpy(dtype=np.float64)
+                    self.columns[row] = present
+                times[row, :len(df)] = pd.DatetimeIndex(df.index).to_numpy(dtype='datetime64[ns]')
+            except Exception as e:
+                # Reported for this symbol only; its row is skipped
+                self.errors[row] = str(e)
+                self.lengths[row] = 0
+
+    def task(self, start: int, stop: int, timestamp: str) -> Dict[str, Any]:
+        """Picklable description of rows [start, stop) for a run stamped `timestamp`"""
+        return {
+            'timestamp': timestamp,
+            'values': self._values.name,
+            'times': self._times.name,
+            'shape': self.shape,
+            'start': start,
+            'symbols': self.symbols[start:stop],
+            'lengths': self.lengths[start:stop],
+            'columns': self.columns[start:stop],
+        }
+
+    def release(self):
+        for shm in (self._values, self._times):
+            shm.close()
+            shm.unlink()
+
+
+_worker_generator = None
+
+
+def _analyze_task(task: Dict[str, Any]) -> Tuple[int, List[SymbolResult]]:
+    """Worker entry point: analyze the task's symbols from shared memory"""
+    global _worker_generator
+    from .signal_generator import SignalGenerator
+
+    if _worker_generator is None:
+        _worker_generator = SignalGenerator()
+    # Pick up config.json edits made since the worker started
+    _worker_generator.config.reload_if_changed()
+
+    values_shm = _attach(task['values'])
+    times_shm = _attach(task['times'])
+    try:
+        values = np.ndarray(task['shape'] + (5,), dtype=np.float64, buffer=values_shm.buf)
+        times = np.ndarray(task['shape'], dtype='datetime64[ns]', buffer=times_shm.buf)
+
+        results: List[SymbolResult] = []
+        for offset, (symbol, length, columns) in enumerate(zip(task['symbols'], task['lengths'], task['columns'])):
+            row = task['start'] + offset
+            try:
+                df = pd.DataFrame(values[row, :length], columns=OHLCV_COLUMNS,
+                                  index=pd.DatetimeIndex(times[row, :length], name='timestamp'), copy=False)
+                if columns is not None:
+                    df = df[columns]
+                results.append((_worker_generator._analyze_symbol(symbol, df, timestamp=task['timestamp']), None))
+            except Exception as e:
+                results.append(([], str(e)))
+            finally:
+                df = None
+        return task['start'], results
+    finally:
+        # Views must be gone before the segments can be closed
+        values = times = None
+        values_shm.close()
+        times_shm.close()
+
+
+class ParallelAnalyzer:
+    """
+    Runs SignalGenerator._analyze_symbol for many symbols in worker processes
+
+    The pool is created on first use and kept between runs. Symbols are
+    split into contiguous chunks (a few per worker) and results are merged
+    back in input order, so the output does not depend on scheduling.
+    """
+
+    def __init__(self, max_workers: int = None):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: ProcessPoolExecutor = None
+
+    def analyze(self, market_data: Dict[str, pd.DataFrame], timestamp: str) -> List[SymbolResult]:
+        """Per-symbol (signals, error) in the order of market_data"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+
+        shared = SharedMarketData(market_data)
+        try:
+            count = len(shared.symbols)
+            chunk = max(1, -(-count // (self.max_workers * 4)))
+            futures = [self._pool.submit(_analyze_task, shared.task(start, min(start + chunk, count), timestamp))
+                       for start in range(0, count, chunk)]
+
+            merged: List[SymbolResult] = [None] * count
+            for future in futures:
+                start, results = future.result()
+                merged[start:start + len(results)] = results
+            for row, error in shared.errors.items():
+                merged[row] = ([], error)
+            return merged
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+        finally:
+            shared.release()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,79 @@
+"""
+Rate Limiter Module
+Sliding-window signal rate limiting that survives restarts
+"""
+
+import json
+import os
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class SlidingWindowLimiter:
+    """
+    Allows at most `limit` events in any trailing `window_seconds`
+
+    Event times are kept in a deque in arrival order, so expiring old ones
+    and counting the rest is amortized O(1) per event. When `state_file`
+    is set, the times in the current window are written to it after every
+    record() (temp file, fsync, atomic rename) and loaded again on start,
+    so the cap holds across runs and restarts.
+    """
+
+    def __init__(self, limit: int, window_seconds: float = 3600.0, state_file: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.state_file = state_file
+        self._events = deque()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                events = sorted(float(t) for t in json.load(f).get('events', []))
+        except Exception as e:
+            self.logger.error(f"Error loading rate limit state: {str(e)}")
+            return
+        self._events.extend(events)
+        self._expire(time.time())
+
+    def _save(self):
+        if not self.state_file:
+            return
+        tmp_path = self.state_file + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'window_seconds': self.window_seconds, 'events': list(self._events)}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_file)
+        except Exception as e:
+            self.logger.error(f"Error saving rate limit state: {str(e)}")
+
+    def _expire(self, now: float):
+        cutoff = now - self.window_seconds
+        while self._events and self._events[0] <= cutoff:
+            self._events.popleft()
+
+    def available(self, now: float = None) -> int:
+        """How many more events the window allows right now"""
+        with self._lock:
+            self._expire(time.time() if now is None else now)
+            return max(0, self.limit - len(self._events))
+
+    def record(self, count: int = 1, now: float = None):
+        """Record `count` events at `now` (default: the current time)"""
+        if count <= 0:
+            return
+        with self._lock:
+            now = time.time() if now is None else now
+            self._expire(now)
+            self._events.extend([now] * count)
+            self._save()
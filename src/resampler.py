@@ -0,0 +1,160 @@
+"""
+Resampler Module
+Incremental multi-timeframe OHLCV aggregation
+"""
+
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from .bar_buffer import BarRingBuffer
+from .market_simulator import OHLCV_COLUMNS
+
+
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+
+def parse_timeframe(timeframe: str) -> pd.Timedelta:
+    """Convert a timeframe string such as '15m' or '4h' to a Timedelta"""
+    # pandas deprecates the lowercase day unit
+    if timeframe.endswith('d'):
+        timeframe = timeframe[:-1] + 'D'
+    try:
+        return pd.Timedelta(timeframe)
+    except ValueError:
+        raise ValueError(f"Invalid timeframe: {timeframe}")
+
+
+class TimeframeResampler:
+    """
+    Builds higher-timeframe bars from a base-resolution bar series
+
+    Each target timeframe keeps its completed bars in a BarRingBuffer and a
+    single open bar. A new base bar only updates the open bar of every
+    timeframe (high/low/close/volume) and closes it when the base bar falls
+    into the next bucket, so no history is ever re-aggregated. Buckets are
+    aligned to the Unix epoch and labelled by their start time, matching
+    DataFrame.resample(label='left', closed='left') for these timeframes.
+    """
+
+    def __init__(self, base_timeframe: str, timeframes: List[str], capacity: int = 100):
+        self.base_timeframe = base_timeframe
+        base_ns = parse_timeframe(base_timeframe).value
+
+        self.timeframes = []
+        self._bucket_ns: Dict[str, int] = {}
+        for timeframe in timeframes:
+            bucket_ns = parse_timeframe(timeframe).value
+            if bucket_ns < base_ns or bucket_ns % base_ns:
+                raise ValueError(f"Timeframe {timeframe} is not a multiple of base timeframe {base_timeframe}")
+            self.timeframes.append(timeframe)
+            self._bucket_ns[timeframe] = bucket_ns
+
+        self._closed = {tf: BarRingBuffer(capacity) for tf in self.timeframes}
+        self._open_bucket: Dict[str, int] = {tf: None for tf in self.timeframes}
+        self._open_bar = {tf: np.zeros(len(OHLCV_COLUMNS)) for tf in self.timeframes}
+        self.last_timestamp = None
+
+    def _close_bar(self, timeframe: str):
+        bucket = self._open_bucket[timeframe]
+        if bucket is None:
+            return
+        start = np.array([bucket * self._bucket_ns[timeframe]], dtype='datetime64[ns]')
+        self._closed[timeframe].append(start, self._open_bar[timeframe].reshape(1, -1))
+
+    def update(self, timestamp, open_: float, high: float, low: float,
+               close: float, volume: float) -> List[Tuple[str, pd.Timestamp]]:
+        """
+        Feed one base bar
+
+        Returns (timeframe, bar start) for every higher-timeframe bar that
+        was closed by this update.
+        """
+        ts_ns = pd.Timestamp(timestamp).value
+        closed = []
+
+        for timeframe in self.timeframes:
+            bucket = ts_ns // self._bucket_ns[timeframe]
+            bar = self._open_bar[timeframe]
+
+            if bucket != self._open_bucket[timeframe]:
+                if self._open_bucket[timeframe] is not None:
+                    self._close_bar(timeframe)
+                    closed.append((timeframe, pd.Timestamp(self._open_bucket[timeframe] * self._bucket_ns[timeframe])))
+                self._open_bucket[timeframe] = bucket
+                bar[:] = (open_, high, low, close, volume)
+            else:
+                bar[HIGH] = max(bar[HIGH], high)
+                bar[LOW] = min(bar[LOW], low)
+                bar[CLOSE] = close
+                bar[VOLUME] += volume
+
+        self.last_timestamp = pd.Timestamp(ts_ns)
+        return closed
+
+    def update_many(self, timestamps: np.ndarray, values: np.ndarray):
+        """
+        Feed a block of base bars at once, e.g. to seed from history
+
+        Args:
+            timestamps: Increasing bar timestamps, shape (n,)
+            values: Bars in OHLCV column order, shape (n, 5)
+        """
+        ts_ns = np.asarray(timestamps, dtype='datetime64[ns]').astype(np.int64)
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+        if len(ts_ns) == 0:
+            return
+
+        for timeframe in self.timeframes:
+            bucket_ns = self._bucket_ns[timeframe]
+            buckets = ts_ns // bucket_ns
+            starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+            ends = np.append(starts[1:], len(buckets)) - 1
+
+            bars = np.empty((len(starts), len(OHLCV_COLUMNS)))
+            bars[:, OPEN] = values[starts, OPEN]
+            bars[:, HIGH] = np.maximum.reduceat(values[:, HIGH], starts)
+            bars[:, LOW] = np.minimum.reduceat(values[:, LOW], starts)
+            bars[:, CLOSE] = values[ends, CLOSE]
+            bars[:, VOLUME] = np.add.reduceat(values[:, VOLUME], starts)
+            group_buckets = buckets[starts]
+
+            # The first group may continue the currently open bar
+            open_bar = self._open_bar[timeframe]
+            if group_buckets[0] == self._open_bucket[timeframe]:
+                bars[0, OPEN] = open_bar[OPEN]
+                bars[0, HIGH] = max(bars[0, HIGH], open_bar[HIGH])
+                bars[0, LOW] = min(bars[0, LOW], open_bar[LOW])
+                bars[0, VOLUME] += open_bar[VOLUME]
+            else:
+                self._close_bar(timeframe)
+
+            if len(bars) > 1:
+                self._closed[timeframe].append((group_buckets[:-1] * bucket_ns).astype('datetime64[ns]'), bars[:-1])
+            self._open_bucket[timeframe] = int(group_buckets[-1])
+            open_bar[:] = bars[-1]
+
+        self.last_timestamp = pd.Timestamp(int(ts_ns[-1]))
+
+    def update_frame(self, df: pd.DataFrame):
+        """Feed base bars from an OHLCV DataFrame, skipping bars already seen"""
+        if self.last_timestamp is not None:
+            df = df[df.index > self.last_timestamp]
+        self.update_many(df.index.to_numpy(), df[OHLCV_COLUMNS].to_numpy())
+
+    def get_frame(self, timeframe: str, include_open: bool = True) -> pd.DataFrame:
+        """
+        Bars for a timeframe, oldest first, indexed by bucket start
+        With include_open the still-forming bar is appended as the last row.
+        """
+        buffer = self._closed[timeframe]
+        index = pd.DatetimeIndex(buffer.timestamps(), name='timestamp')
+        df = pd.DataFrame(buffer.window(), index=index, columns=OHLCV_COLUMNS)
+
+        if include_open and self._open_bucket[timeframe] is not None:
+            start = pd.Timestamp(self._open_bucket[timeframe] * self._bucket_ns[timeframe])
+            open_row = pd.DataFrame([self._open_bar[timeframe]], columns=OHLCV_COLUMNS,
+                                    index=pd.DatetimeIndex([start], name='timestamp'))
+            df = pd.concat([df, open_row])
+
+        return df
@@ -0,0 +1,102 @@
+"""
+Signal Cooldown Module
+Suppresses repeats of the same signal while its condition stays true
+"""
+
+import json
+import os
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from .signal_record import Signal
+
+CooldownKey = Tuple[str, str, str]
+
+
+def signal_key(signal: Signal) -> CooldownKey:
+    """(symbol, rule, direction) of a signal"""
+    return (signal.symbol, signal.rule or ','.join(signal.indicators), signal.action.value)
+
+
+class CooldownCache:
+    """
+    Time-based cooldown per (symbol, rule, direction)
+
+    Entries map a key to the time its cooldown ends. They are kept in an
+    OrderedDict ordered by that time (every entry gets the same TTL), so
+    expired entries are dropped from the front and, once max_entries is
+    reached, the entry closest to expiring is evicted first. With a
+    state_file, live entries are saved after every mark() and reloaded on
+    start, so a restart does not resend signals that are still cooling down.
+    """
+
+    def __init__(self, cooldown_seconds: float = 14400.0, max_entries: int = 10_000,
+                 state_file: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.cooldown_seconds = cooldown_seconds
+        self.max_entries = max_entries
+        self.state_file = state_file
+        self._entries: 'OrderedDict[CooldownKey, float]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self):
+        if not self.state_file or not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                entries = json.load(f).get('entries', [])
+        except Exception as e:
+            self.logger.error(f"Error loading signal cooldowns: {str(e)}")
+            return
+        for symbol, rule, action, expires in sorted(entries, key=lambda entry: entry[3]):
+            self._entries[(symbol, rule, action)] = float(expires)
+        self._expire(time.time())
+        self._evict()
+
+    def _save(self):
+        if not self.state_file:
+            return
+        tmp_path = self.state_file + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'entries': [[*key, expires] for key, expires in self._entries.items()]}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.state_file)
+        except Exception as e:
+            self.logger.error(f"Error saving signal cooldowns: {str(e)}")
+
+    def _expire(self, now: float):
+        while self._entries:
+            key, expires = next(iter(self._entries.items()))
+            if expires > now:
+                break
+            self._entries.popitem(last=False)
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def active(self, key: CooldownKey, now: float = None) -> bool:
+        """Whether the key is still cooling down"""
+        expires = self._entries.get(key)
+        return expires is not None and expires > (time.time() if now is None else now)
+
+    def mark(self, keys, now: float = None):
+        """Start (or restart) the cooldown of the given keys"""
+        with self._lock:
+            now = time.time() if now is None else now
+            self._expire(now)
+            expires = now + self.cooldown_seconds
+            for key in keys:
+                self._entries.pop(key, None)
+                self._entries[key] = expires
+            self._evict()
+            self._save()
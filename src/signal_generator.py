@@ -3,239 +3,268 @@ Signal Generator Module
 Analyzes market data and generates trading signals
 """
 
-import json
+import heapq
 import logging
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List
+import numpy as np
 import pandas as pd
 
+from .config import get_config
+from .indicator_plan import IndicatorPlan
+from .market_simulator import OHLCV_COLUMNS
+from .parallel_signals import ParallelAnalyzer
+from .rate_limiter import SlidingWindowLimiter
+from .signal_cooldown import CooldownCache, signal_key
+from .signal_record import Signal
+from .signal_rules import RuleSet
+from .streaming_indicators import StreamingIndicatorSet
 from .technical_indicators import TechnicalIndicators
 
 
 class SignalGenerator:
-    """Generates trading signals based on technical analysis"""
+    """
+    Generates trading signals based on technical analysis
+    
+    Rules are declared in signal_rules (plus any signals.definitions in the
+    config) and compiled once into a RuleSet; the live path evaluates it on
+    the last bars, scan_history() on every bar of every symbol.
+    """
+    
+    MIN_BARS = 50  # Need enough data for analysis
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.config = self._load_config()
+        self.config = get_config()
         self.indicators = TechnicalIndicators()
-        
-    def _load_config(self) -> Dict:
-        """Load configuration from config.json"""
-        try:
-            with open('config.json', 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.error(f"Error loading config: {str(e)}")
-            return {}
+        self._streaming: Dict[str, StreamingIndicatorSet] = {}
+        self._rules_key = None
+        self._rules: RuleSet = None
+        self._streaming_rules_key = None
+        self._streaming_rules: RuleSet = None
+        self._plan: IndicatorPlan = None
+        self._parallel: ParallelAnalyzer = None
+        self._limiter: SlidingWindowLimiter = None
+        self._limiter_settings = None
+        self._cooldown_cache: CooldownCache = None
+        self._cooldown_settings = None
     
-    def generate_signals(self, market_data: Dict[str, pd.DataFrame]) -> List[Dict[str, Any]]:
+    def generate_signals(self, market_data: Dict[str, pd.DataFrame]) -> List[Signal]:
         """
         Generate trading signals for all symbols
-        Returns list of signal dictionaries
+        Returns list of Signal records, all stamped with the time of this run
+        
+        With signals.parallel.mode set to "processes" (and panel_mode off),
+        symbols are analyzed in worker processes; see _analyze_parallel.
         """
+        timestamp = datetime.now().isoformat()
+        parallel_config = self.config.get('signals', {}).get('parallel', {})
+        if (parallel_config.get('mode', 'sequential') == 'processes'
+                and not self.config.indicators.panel_mode
+                and len(market_data) >= parallel_config.get('min_symbols', 100)):
+            signals = self._analyze_parallel(market_data, timestamp, parallel_config.get('max_workers'))
+            if signals is not None:
+                return self._filter_signals(signals)
+        
         signals = []
+        panel_indicators = self._calculate_panel(market_data) if self.config.indicators.panel_mode else {}
         
         for symbol, df in market_data.items():
             try:
-                symbol_signals = self._analyze_symbol(symbol, df)
+                symbol_signals = self._analyze_symbol(symbol, df, panel_indicators.get(symbol), timestamp)
                 signals.extend(symbol_signals)
             except Exception as e:
                 self.logger.error(f"Error analyzing {symbol}: {str(e)}")
         
-        # Filter signals by confidence threshold
-        min_confidence = self.config.get('notifications', {}).get('min_confidence', 65.0)
-        filtered_signals = [s for s in signals if s['confidence'] >= min_confidence]
-        
-        # Limit number of signals per run
-        max_signals = self.config.get('trading', {}).get('max_signals_per_hour', 5)
-        return filtered_signals[:max_signals]
+        return self._filter_signals(signals)
     
-    def _analyze_symbol(self, symbol: str, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Analyze a single symbol and generate signals"""
-        if len(df) < 50:  # Need enough data for analysis
-            return []
+    def _analyze_parallel(self, market_data: Dict[str, pd.DataFrame], timestamp: str,
+                          max_workers: int = None) -> List[Signal]:
+        """
+        Analyze symbols across worker processes
+        The OHLCV windows are shared with the workers through shared memory
+        and results are merged in symbol order, matching the sequential
+        path. Returns None if the pool cannot be used, in which case the
+        caller falls back to analyzing in this process.
+        """
+        if self._parallel is None or self._parallel.max_workers != (max_workers or self._parallel.max_workers):
+            if self._parallel is not None:
+                self._parallel.shutdown()
+            self._parallel = ParallelAnalyzer(max_workers)
         
-        # Calculate all indicators
-        df_with_indicators = TechnicalIndicators.calculate_all_indicators(df, self.config)
+        try:
+            results = self._parallel.analyze(market_data, timestamp)
+        except Exception as e:
+            self.logger.warning(f"Parallel analysis unavailable, analyzing in process: {str(e)}")
+            return None
         
         signals = []
-        latest_data = df_with_indicators.iloc[-1]
-        previous_data = df_with_indicators.iloc[-2]
-        
-        # RSI-based signals
-        rsi_signals = self._check_rsi_signals(symbol, latest_data, previous_data)
-        signals.extend(rsi_signals)
-        
-        # Moving Average Crossover signals
-        ma_signals = self._check_ma_crossover(symbol, df_with_indicators.tail(10))
-        signals.extend(ma_signals)
+        for symbol, (symbol_signals, error) in zip(market_data, results):
+            if error is not None:
+                self.logger.error(f"Error analyzing {symbol}: {error}")
+            signals.extend(symbol_signals)
+        return signals
+    
+    def process_bar(self, symbol: str, open_: float, high: float, low: float,
+                    close: float, volume: float = 0.0) -> List[Signal]:
+        """
+        Generate signals for one new bar of a symbol in constant time
+        Indicators are updated incrementally instead of being recomputed
+        over the whole window; use warm_up() to seed them from history.
+        """
+        state = self._streaming.get(symbol)
+        if state is None:
+            state = self._streaming[symbol] = StreamingIndicatorSet(self.config)
         
-        # MACD signals
-        macd_signals = self._check_macd_signals(symbol, latest_data, previous_data)
-        signals.extend(macd_signals)
+        state.update(open_, high, low, close, volume)
+        if state.count < self.MIN_BARS:
+            return []
         
-        # Bollinger Band signals
-        bb_signals = self._check_bollinger_signals(symbol, latest_data, previous_data)
-        signals.extend(bb_signals)
+        try:
+            signals = self._evaluate_rules(symbol, state.latest, state.previous)
+        except Exception as e:
+            self.logger.error(f"Error analyzing {symbol}: {str(e)}")
+            return []
         
-        return signals
+        return self._filter_signals(signals)
     
-    def _check_rsi_signals(self, symbol: str, latest: pd.Series, previous: pd.Series) -> List[Dict[str, Any]]:
-        """Check for RSI-based trading signals"""
-        signals = []
+    def warm_up(self, symbol: str, df: pd.DataFrame):
+        """Seed the streaming indicator state of a symbol from historical bars"""
+        state = self._streaming[symbol] = StreamingIndicatorSet(self.config)
+        state.update_frame(df)
+    
+    def _filter_signals(self, signals: List[Signal]) -> List[Signal]:
+        """
+        Apply the confidence threshold, the cooldown and the hourly signal cap
+        Signals whose (symbol, rule, direction) was sent within the cooldown
+        are dropped before anything is stored or sent. The cap is enforced
+        over a sliding window across runs (see _rate_limiter); of the
+        candidates, the highest-confidence ones that fit are kept, highest
+        first, ties in generation order.
+        """
+        # Filter signals by confidence threshold
+        min_confidence = self.config.notifications.min_confidence
+        candidates = (s for s in signals if s.confidence >= min_confidence)
         
-        rsi_oversold = self.config.get('indicators', {}).get('rsi_oversold', 30)
-        rsi_overbought = self.config.get('indicators', {}).get('rsi_overbought', 70)
-        
-        current_rsi = latest['rsi']
-        prev_rsi = previous['rsi']
-        
-        if pd.isna(current_rsi) or pd.isna(prev_rsi):
-            return signals
-        
-        # RSI oversold to neutral (buy signal)
-        if prev_rsi <= rsi_oversold and current_rsi > rsi_oversold:
-            signals.append({
-                'symbol': symbol,
-                'action': 'buy',
-                'price': latest['close'],
-                'confidence': min(95, 70 + (rsi_oversold - prev_rsi)),
-                'indicators': ['RSI Oversold Recovery'],
-                'timestamp': datetime.now().isoformat(),
-                'details': f'RSI: {current_rsi:.1f} (was {prev_rsi:.1f})'
-            })
-        
-        # RSI overbought to neutral (sell signal)
-        elif prev_rsi >= rsi_overbought and current_rsi < rsi_overbought:
-            signals.append({
-                'symbol': symbol,
-                'action': 'sell',
-                'price': latest['close'],
-                'confidence': min(95, 70 + (prev_rsi - rsi_overbought)),
-                'indicators': ['RSI Overbought Decline'],
-                'timestamp': datetime.now().isoformat(),
-                'details': f'RSI: {current_rsi:.1f} (was {prev_rsi:.1f})'
-            })
+        # Drop repeats of signals sent within the cooldown
+        cooldown = self._cooldown()
+        candidates = (s for s in candidates if not cooldown.active(signal_key(s)))
         
-        return signals
+        limiter = self._rate_limiter()
+        allowed = limiter.available()
+        if allowed <= 0:
+            return []
+        
+        # Bounded heap: O(n log k) for n candidates and k allowed signals
+        selected = heapq.nlargest(allowed, candidates, key=lambda s: s.confidence)
+        if selected:
+            limiter.record(len(selected))
+            cooldown.mark(signal_key(s) for s in selected)
+        return selected
     
-    def _check_ma_crossover(self, symbol: str, recent_data: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Check for moving average crossover signals"""
-        signals = []
+    def _cooldown(self) -> CooldownCache:
+        """Per (symbol, rule, direction) cooldown, recreated when its settings change"""
+        settings = self.config.signals.cooldown
+        if self._cooldown_cache is None or self._cooldown_settings != settings:
+            self._cooldown_cache = CooldownCache(settings.seconds, settings.max_entries, settings.state_file)
+            self._cooldown_settings = settings
+        return self._cooldown_cache
+    
+    def _rate_limiter(self) -> SlidingWindowLimiter:
+        """Hourly signal limiter, recreated when its settings change"""
+        rate_limit = self.config.signals.rate_limit
+        limit = self.config.trading.max_signals_per_hour
+        if self._limiter is None or self._limiter_settings != rate_limit or self._limiter.limit != limit:
+            self._limiter = SlidingWindowLimiter(limit, rate_limit.window_seconds, rate_limit.state_file)
+            self._limiter_settings = rate_limit
+        return self._limiter
+    
+    def _calculate_panel(self, market_data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Calculate indicators for all analyzable symbols in one panel pass"""
+        try:
+            eligible = {symbol: df for symbol, df in market_data.items() if len(df) >= self.MIN_BARS}
+            if not eligible:
+                return {}
+            return TechnicalIndicators.calculate_panel(eligible, self.config, columns=self._indicator_plan().columns)
+        except Exception as e:
+            self.logger.error(f"Error calculating indicator panel: {str(e)}")
+            return {}
+    
+    def _analyze_symbol(self, symbol: str, df: pd.DataFrame,
+                        df_with_indicators: pd.DataFrame = None, timestamp: str = None) -> List[Signal]:
+        """Analyze a single symbol and generate signals stamped with timestamp (default: now)"""
+        if len(df) < self.MIN_BARS:
+            return []
         
-        if len(recent_data) < 2:
-            return signals
-        
-        sma_periods = self.config.get('indicators', {}).get('sma_periods', [20, 50])
-        if len(sma_periods) < 2:
-            return signals
-        
-        fast_ma = f'sma_{sma_periods[0]}'
-        slow_ma = f'sma_{sma_periods[1]}'
-        
-        if fast_ma not in recent_data.columns or slow_ma not in recent_data.columns:
-            return signals
-        
-        latest = recent_data.iloc[-1]
-        previous = recent_data.iloc[-2]
-        
-        # Golden Cross (bullish)
-        if (previous[fast_ma] <= previous[slow_ma] and 
-            latest[fast_ma] > latest[slow_ma]):
-            signals.append({
-                'symbol': symbol,
-                'action': 'buy',
-                'price': latest['close'],
-                'confidence': 75.0,
-                'indicators': [f'Golden Cross (SMA{sma_periods[0]}/SMA{sma_periods[1]})'],
-                'timestamp': datetime.now().isoformat(),
-                'details': f'Fast MA: {latest[fast_ma]:.2f}, Slow MA: {latest[slow_ma]:.2f}'
-            })
-        
-        # Death Cross (bearish)
-        elif (previous[fast_ma] >= previous[slow_ma] and 
-              latest[fast_ma] < latest[slow_ma]):
-            signals.append({
-                'symbol': symbol,
-                'action': 'sell',
-                'price': latest['close'],
-                'confidence': 75.0,
-                'indicators': [f'Death Cross (SMA{sma_periods[0]}/SMA{sma_periods[1]})'],
-                'timestamp': datetime.now().isoformat(),
-                'details': f'Fast MA: {latest[fast_ma]:.2f}, Slow MA: {latest[slow_ma]:.2f}'
-            })
+        # Calculate the indicators the enabled rules need unless the panel pass already did
+        if df_with_indicators is None:
+            df_with_indicators = self._indicator_plan().apply(df)
         
-        return signals
+        rules = self._rule_set()
+        recent = df_with_indicators.iloc[-(rules.max_lag + 1):]
+        columns = {column: recent[column].to_numpy(dtype=np.float64) for column in rules.columns}
+        return rules.signals(symbol, columns, timestamps=timestamp or datetime.now().isoformat(), last_only=True)
     
-    def _check_macd_signals(self, symbol: str, latest: pd.Series, previous: pd.Series) -> List[Dict[str, Any]]:
-        """Check for MACD-based signals"""
-        signals = []
+    def scan_history(self, market_data: Dict[str, pd.DataFrame]) -> List[Signal]:
+        """
+        Signals the enabled rules give on every bar of every symbol
+        All symbols are evaluated in one pass over the indicator panel; bars
+        with less than MIN_BARS of history are skipped like in live mode.
+        Signals carry their bar's timestamp and are filtered by confidence
+        but not by the per-run limit.
+        """
+        eligible = {symbol: df for symbol, df in market_data.items() if len(df) >= self.MIN_BARS}
+        if not eligible:
+            return []
         
-        if pd.isna(latest['macd']) or pd.isna(latest['macd_signal']):
-            return signals
-        
-        # MACD bullish crossover
-        if (previous['macd'] <= previous['macd_signal'] and 
-            latest['macd'] > latest['macd_signal'] and
-            latest['macd'] < 0):  # Below zero line for stronger signal
-            signals.append({
-                'symbol': symbol,
-                'action': 'buy',
-                'price': latest['close'],
-                'confidence': 80.0,
-                'indicators': ['MACD Bullish Crossover'],
-                'timestamp': datetime.now().isoformat(),
-                'details': f'MACD: {latest["macd"]:.4f}, Signal: {latest["macd_signal"]:.4f}'
-            })
-        
-        # MACD bearish crossover
-        elif (previous['macd'] >= previous['macd_signal'] and 
-              latest['macd'] < latest['macd_signal'] and
-              latest['macd'] > 0):  # Above zero line for stronger signal
-            signals.append({
-                'symbol': symbol,
-                'action': 'sell',
-                'price': latest['close'],
-                'confidence': 80.0,
-                'indicators': ['MACD Bearish Crossover'],
-                'timestamp': datetime.now().isoformat(),
-                'details': f'MACD: {latest["macd"]:.4f}, Signal: {latest["macd_signal"]:.4f}'
-            })
+        rules = self._rule_set()
+        block, names = TechnicalIndicators.calculate_panel_block(eligible, self.config, self._indicator_plan().columns)
+        num_bars = block.shape[1]
+        min_confidence = self.config.notifications.min_confidence
         
-        return signals
-    
-    def _check_bollinger_signals(self, symbol: str, latest: pd.Series, previous: pd.Series) -> List[Dict[str, Any]]:
-        """Check for Bollinger Band signals"""
         signals = []
-        
-        if pd.isna(latest['bb_upper']) or pd.isna(latest['bb_lower']):
-            return signals
-        
-        # Price bouncing off lower band (buy signal)
-        if (previous['close'] <= previous['bb_lower'] and 
-            latest['close'] > latest['bb_lower']):
-            signals.append({
-                'symbol': symbol,
-                'action': 'buy',
-                'price': latest['close'],
-                'confidence': 70.0,
-                'indicators': ['Bollinger Band Bounce (Lower)'],
-                'timestamp': datetime.now().isoformat(),
-                'details': f'Price: {latest["close"]:.2f}, Lower Band: {latest["bb_lower"]:.2f}'
-            })
-        
-        # Price bouncing off upper band (sell signal)
-        elif (previous['close'] >= previous['bb_upper'] and 
-              latest['close'] < latest['bb_upper']):
-            signals.append({
-                'symbol': symbol,
-                'action': 'sell',
-                'price': latest['close'],
-                'confidence': 70.0,
-                'indicators': ['Bollinger Band Bounce (Upper)'],
-                'timestamp': datetime.now().isoformat(),
-                'details': f'Price: {latest["close"]:.2f}, Upper Band: {latest["bb_upper"]:.2f}'
-            })
+        for row, (symbol, df) in enumerate(eligible.items()):
+            offset = num_bars - len(df)
+            columns = {name: block[row, offset:, i] for i, name in enumerate(names)}
+            symbol_signals = rules.signals(symbol, columns, timestamps=df.index, start=self.MIN_BARS - 1)
+            signals.extend(s for s in symbol_signals if s.confidence >= min_confidence)
         
         return signals
+    
+    def _rule_set(self) -> RuleSet:
+        """Compiled rules for the current config, rebuilt when it changes"""
+        key = (self.config.signals, self.config.indicators)
+        if key != self._rules_key:
+            self._rules = RuleSet.from_config(self.config)
+            indicator_columns = [c for c in self._rules.columns if c not in OHLCV_COLUMNS]
+            self._plan = IndicatorPlan(indicator_columns, self.config)
+            self._rules_key = key
+        return self._rules
+    
+    def _streaming_rule_set(self) -> RuleSet:
+        """
+        Rules process_bar can evaluate: those reading only columns that
+        StreamingIndicatorSet maintains. The others are skipped with a
+        warning and only run in the batch paths.
+        """
+        key = (self.config.signals, self.config.indicators)
+        if key != self._streaming_rules_key:
+            self._streaming_rules = RuleSet.from_config(self.config, StreamingIndicatorSet.available_columns(self.config))
+            self._streaming_rules_key = key
+        return self._streaming_rules
+    
+    def _indicator_plan(self) -> IndicatorPlan:
+        """Indicator plan computing only the columns the enabled rules read"""
+        self._rule_set()
+        return self._plan
+    
+    def _evaluate_rules(self, symbol: str, latest_data, previous_data) -> List[Signal]:
+        """
+        Run the enabled rules on the latest and previous rows
+        Rows are the dicts kept by StreamingIndicatorSet, so only the
+        streaming rule set is evaluated.
+        """
+        rules = self._streaming_rule_set()
+        columns = {column: np.array([previous_data[column], latest_data[column]], dtype=np.float64)
+                   for column in rules.columns}
+        return rules.signals(symbol, columns, timestamps=datetime.now().isoformat(), last_only=True)
@@ -3,115 +3,166 @@ Signal History Module
 Handles storage and retrieval of trading signals
 """
 
+import atexit
+import csv
+import gzip
+import itertools
 import json
-import os
 import logging
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Any, Dict, Iterator, List, Union
+
+from .config import get_config
+from .signal_record import Action, Signal
+from .signal_store import JsonlSignalStore, SqliteSignalStore
+
+EXPORT_EXTENSIONS = {'json': 'json', 'ndjson': 'jsonl', 'ndjson.gz': 'jsonl.gz', 'csv': 'csv'}
+CSV_COLUMNS = ['id', 'saved_at', 'timestamp', 'symbol', 'rule', 'action', 'price', 'confidence',
+               'indicators', 'details']
+
+
+def _chunks(items: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    """Consecutive lists of up to size items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
 
 class SignalHistory:
-    """Manages signal history storage and retrieval"""
+    """
+    Manages signal history storage and retrieval
+
+    Storage is chosen by history.backend in config.json: "jsonl" (default)
+    keeps the newest history.max_signals in memory over an append-only log
+    (see JsonlSignalStore), "sqlite" keeps every signal in an indexed
+    SQLite database (see SqliteSignalStore).
     
-    def __init__(self, history_file: str = "signal_history.json"):
-        self.logger = logging.getLogger(__name__)
-        self.history_file = history_file
-        self.signals = self._load_history()
+    With history.write_mode "batched", save_signal() only queues the signal
+    and the queue is written to the store in one batch when it reaches
+    history.batch_size, every history.flush_interval_seconds, on flush()
+    and at exit; reads flush first, so they always see every saved signal.
+    Signals still queued are lost if the process crashes, so the delay is
+    traded against how much history.durability makes each write wait for.
+    """
     
-    def _load_history(self) -> List[Dict[str, Any]]:
-        """Load signal history from file"""
-        if not os.path.exists(self.history_file):
-            self.logger.info(f"History file {self.history_file} not found, starting with empty history")
-            return []
+    def __init__(self, history_file: str = None, backend: str = None):
+        self.logger = logging.getLogger(__name__)
+        history_config = get_config().get('history', {})
+        self.backend = backend or history_config.get('backend', 'jsonl')
+        max_age_days = history_config.get('max_age_days')
+        durability = history_config.get('durability', 'buffered')
         
-        try:
-            with open(self.history_file, 'r') as f:
-                signals = json.load(f)
-                self.logger.info(f"Loaded {len(signals)} signals from history")
-                return signals
-        except Exception as e:
-            self.logger.error(f"Error loading signal history: {str(e)}")
-            return []
-    
-    def _save_history(self):
-        """Save signal history to file"""
-        try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.signals, f, indent=2, default=str)
-            self.logger.debug(f"Saved {len(self.signals)} signals to history")
-        except Exception as e:
-            self.logger.error(f"Error saving signal history: {str(e)}")
+        if self.backend == 'sqlite':
+            self.history_file = history_file or history_config.get('sqlite_file', 'signal_history.db')
+            self.store = SqliteSignalStore(self.history_file, max_age_days=max_age_days, durability=durability)
+        else:
+            self.history_file = history_file or history_config.get('file', 'signal_history.jsonl')
+            self.store = JsonlSignalStore(
+                self.history_file,
+                max_signals=int(history_config.get('max_signals', 1000)),
+                max_age_days=max_age_days,
+                compact_interval=float(history_config.get('compact_interval_seconds', 300)),
+                durability=durability
+            )
+        
+        self.batched = history_config.get('write_mode', 'immediate') == 'batched'
+        self.batch_size = int(history_config.get('batch_size', 50))
+        self.flush_interval = float(history_config.get('flush_interval_seconds', 5))
+        self._pending: List[Signal] = []
+        self._pending_lock = threading.Lock()
+        self._flusher: threading.Thread = None
+        # Per-instance counter: cheap on any backend and unique even at the signal cap
+        self._id_sequence = itertools.count()
+        if self.batched:
+            atexit.register(self.flush)
     
-    def save_signal(self, signal: Dict[str, Any]) -> bool:
+    def save_signal(self, signal: Union[Signal, Dict[str, Any]]) -> bool:
         """
-        Save a new signal to history
+        Save a new signal (a Signal or its dict form) to history
         Returns True if successful, False otherwise
         """
         try:
-            # Add unique ID and save timestamp
-            signal['id'] = self._generate_signal_id()
-            signal['saved_at'] = datetime.now().isoformat()
+            if not isinstance(signal, Signal):
+                signal = Signal.from_dict(signal)
             
-            # Add to signals list
-            self.signals.append(signal)
-            
-            # Clean up old signals (keep last 1000)
-            if len(self.signals) > 1000:
-                self.signals = self.signals[-1000:]
+            # Add unique ID and save timestamp
+            signal.id = self._generate_signal_id()
+            signal.saved_at = datetime.now().isoformat()
             
-            # Save to file
-            self._save_history()
+            if self.batched:
+                with self._pending_lock:
+                    self._pending.append(signal)
+                    full = len(self._pending) >= self.batch_size
+                self._start_flusher()
+                if full:
+                    self.flush()
+            else:
+                self.store.add(signal)
             
-            self.logger.debug(f"Signal saved: {signal['symbol']} - {signal['action']}")
+            self.logger.debug(f"Signal saved: {signal.symbol} - {signal.action.value}")
             return True
             
         except Exception as e:
             self.logger.error(f"Error saving signal: {str(e)}")
             return False
     
+    def flush(self) -> bool:
+        """
+        Write queued signals to the store in one batch
+        Returns True if successful (or nothing was queued), False otherwise
+        """
+        with self._pending_lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return True
+        
+        try:
+            self.store.add_many(batch)
+            self.logger.debug(f"Flushed {len(batch)} signals to history")
+            return True
+        except Exception as e:
+            # Queued again ahead of newer signals for the next flush
+            with self._pending_lock:
+                self._pending[:0] = batch
+            self.logger.error(f"Error flushing {len(batch)} signals to history: {str(e)}")
+            return False
+    
+    def _run_flusher(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+    
+    def _start_flusher(self):
+        """Start the background flush timer on the first queued signal"""
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run_flusher, name='signal-history-flusher', daemon=True)
+            self._flusher.start()
+    
     def get_signals(self, 
                    symbol: str = None, 
                    action: str = None, 
                    days: int = None,
-                   limit: int = None) -> List[Dict[str, Any]]:
+                   limit: int = None) -> List[Signal]:
         """
-        Get signals with optional filtering
+        Get signals with optional filtering, newest first
         """
-        filtered_signals = self.signals.copy()
-        
-        # Filter by symbol
-        if symbol:
-            filtered_signals = [s for s in filtered_signals if s.get('symbol') == symbol]
-        
-        # Filter by action
-        if action:
-            filtered_signals = [s for s in filtered_signals if s.get('action') == action]
-        
-        # Filter by date range
-        if days:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            filtered_signals = [
-                s for s in filtered_signals 
-                if datetime.fromisoformat(s.get('timestamp', '1970-01-01')) >= cutoff_date
-            ]
-        
-        # Sort by timestamp (newest first)
-        filtered_signals.sort(
-            key=lambda x: x.get('timestamp', '1970-01-01'), 
-            reverse=True
-        )
-        
-        # Apply limit
-        if limit:
-            filtered_signals = filtered_signals[:limit]
-        
-        return filtered_signals
+        self.flush()
+        since = datetime.now() - timedelta(days=days) if days else None
+        return self.store.query(symbol=symbol, action=Action.parse(action) if action else None,
+                                since=since, limit=limit)
     
     def get_signal_stats(self, days: int = 30) -> Dict[str, Any]:
         """Get signal statistics for the specified period"""
-        signals = self.get_signals(days=days)
+        self.flush()
+        since = datetime.now() - timedelta(days=days) if days else None
+        stats = self.store.stats(since)
         
-        if not signals:
+        if not stats.total:
             return {
                 'total_signals': 0,
                 'buy_signals': 0,
@@ -121,23 +172,18 @@ class SignalHistory:
                 'date_range': f"Last {days} days"
             }
         
-        buy_signals = [s for s in signals if s.get('action') == 'buy']
-        sell_signals = [s for s in signals if s.get('action') == 'sell']
-        symbols = list(set(s.get('symbol') for s in signals))
-        
-        confidences = [s.get('confidence', 0) for s in signals if s.get('confidence')]
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0
+        avg_confidence = stats.confidence_sum / stats.confidence_count if stats.confidence_count else 0
         
         return {
-            'total_signals': len(signals),
-            'buy_signals': len(buy_signals),
-            'sell_signals': len(sell_signals),
-            'symbols': symbols,
+            'total_signals': stats.total,
+            'buy_signals': stats.actions[Action.BUY],
+            'sell_signals': stats.actions[Action.SELL],
+            'symbols': sorted(stats.symbols),
             'avg_confidence': round(avg_confidence, 1),
             'date_range': f"Last {days} days"
         }
     
-    def get_recent_signals(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_recent_signals(self, limit: int = 10) -> List[Signal]:
         """Get most recent signals"""
         return self.get_signals(limit=limit)
     
@@ -146,18 +192,12 @@ class SignalHistory:
         Delete signals older than specified days
         Returns number of deleted signals
         """
+        self.flush()
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        initial_count = len(self.signals)
-        self.signals = [
-            s for s in self.signals 
-            if datetime.fromisoformat(s.get('timestamp', '1970-01-01')) >= cutoff_date
-        ]
-        
-        deleted_count = initial_count - len(self.signals)
+        deleted_count = self.store.delete_before(cutoff_date)
         
         if deleted_count > 0:
-            self._save_history()
             self.logger.info(f"Deleted {deleted_count} old signals")
         
         return deleted_count
@@ -165,33 +205,81 @@ class SignalHistory:
     def _generate_signal_id(self) -> str:
         """Generate unique signal ID"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"signal_{timestamp}_{len(self.signals)}"
+        return f"signal_{timestamp}_{next(self._id_sequence)}"
     
-    def export_signals(self, filename: str = None, days: int = None) -> bool:
+    def export_signals(self, filename: str = None, days: int = None, file_format: str = None,
+                       chunk_size: int = 1000) -> bool:
         """
-        Export signals to JSON file
+        Export signals to a file, streaming them chunk_size at a time
+        file_format is "json" (an export document with a signals array),
+        "ndjson", "ndjson.gz" or "csv"; by default it follows the filename
+        extension (.jsonl/.ndjson, .gz, .csv) and is "json" otherwise.
         Returns True if successful, False otherwise
         """
+        if not file_format:
+            name = (filename or '').lower()
+            file_format = ('ndjson.gz' if name.endswith('.gz') else
+                           'csv' if name.endswith('.csv') else
+                           'ndjson' if name.endswith(('.jsonl', '.ndjson')) else 'json')
+        if file_format not in EXPORT_EXTENSIONS:
+            self.logger.error(f"Unsupported export format: {file_format}")
+            return False
+        
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"signals_export_{timestamp}.json"
+            filename = f"signals_export_{timestamp}.{EXPORT_EXTENSIONS[file_format]}"
         
         try:
-            signals_to_export = self.get_signals(days=days) if days else self.signals
+            self.flush()
+            since = datetime.now() - timedelta(days=days) if days else None
+            signals = self.store.iter_signals(since, chunk_size)
+            opener = gzip.open if file_format == 'ndjson.gz' else open
             
-            export_data = {
-                'export_date': datetime.now().isoformat(),
-                'total_signals': len(signals_to_export),
-                'date_range': f"Last {days} days" if days else "All time",
-                'signals': signals_to_export
-            }
-            
-            with open(filename, 'w') as f:
-                json.dump(export_data, f, indent=2, default=str)
+            with opener(filename, 'wt', newline='' if file_format == 'csv' else None) as f:
+                if file_format == 'csv':
+                    count = self._write_csv(f, signals, chunk_size)
+                elif file_format == 'json':
+                    count = self._write_json(f, signals, chunk_size, days)
+                else:
+                    count = 0
+                    for chunk in _chunks(signals, chunk_size):
+                        f.writelines(signal.to_json() + '\n' for signal in chunk)
+                        count += len(chunk)
             
-            self.logger.info(f"Exported {len(signals_to_export)} signals to {filename}")
+            self.logger.info(f"Exported {count} signals to {filename}")
             return True
             
         except Exception as e:
             self.logger.error(f"Error exporting signals: {str(e)}")
             return False
+    
+    @staticmethod
+    def _write_json(f, signals: Iterator[Signal], chunk_size: int, days: int = None) -> int:
+        """Export document written incrementally; total_signals comes after the array"""
+        f.write('{"export_date": %s, "date_range": %s, "signals": [' % (
+            json.dumps(datetime.now().isoformat()), json.dumps(f"Last {days} days" if days else "All time")))
+        count = 0
+        for chunk in _chunks(signals, chunk_size):
+            f.write((',\n' if count else '\n') + ',\n'.join(signal.to_json() for signal in chunk))
+            count += len(chunk)
+        f.write('\n], "total_signals": %d}\n' % count)
+        return count
+    
+    @staticmethod
+    def _write_csv(f, signals: Iterator[Signal], chunk_size: int) -> int:
+        writer = csv.writer(f)
+        writer.writerow(CSV_COLUMNS)
+        count = 0
+        for chunk in _chunks(signals, chunk_size):
+            writer.writerows(
+                (s.id, s.saved_at, s.timestamp, s.symbol, s.rule, s.action.value, s.price, s.confidence,
+                 ', '.join(s.indicators), s.details)
+                for s in chunk
+            )
+            count += len(chunk)
+        return count
+    
+    def close(self):
+        """Flush queued signals and release the storage backend"""
+        self.flush()
+        self.store.close()
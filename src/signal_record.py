@@ -0,0 +1,116 @@
+"""
+Signal Record Module
+Typed trading signal shared by the generator, history, database and web API
+"""
+
+import json
+import sys
+from enum import Enum
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+
+class Action(str, Enum):
+    """Signal direction; the value is the English name used in JSON"""
+    BUY = 'buy'
+    SELL = 'sell'
+
+    @property
+    def portuguese(self) -> str:
+        """Direction name of the web API ('compra'/'venda')"""
+        return _PORTUGUESE[self]
+
+    @classmethod
+    def parse(cls, value: Any) -> 'Action':
+        """Action from 'buy'/'sell', 'compra'/'venda' or an Action"""
+        if isinstance(value, cls):
+            return value
+        name = str(value).strip().lower()
+        return _FROM_PORTUGUESE.get(name) or cls(name)
+
+
+_PORTUGUESE = {Action.BUY: 'compra', Action.SELL: 'venda'}
+_FROM_PORTUGUESE = {name: action for action, name in _PORTUGUESE.items()}
+
+
+class Signal:
+    """
+    One trading signal
+
+    Slotted, so a retained signal carries no per-instance dict. Symbols and
+    indicator labels are interned and every signal of a run shares the same
+    timestamp string, so the history keeps one copy of each. to_dict()
+    gives the English JSON schema used by the history file and /api/signals;
+    to_api() gives the Portuguese payload of POST /api/signal.
+    """
+
+    __slots__ = ('symbol', 'action', 'price', 'confidence', 'indicators',
+                 'timestamp', 'details', 'rule', 'id', 'saved_at')
+
+    def __init__(self, symbol: str, action: Any, price: float, confidence: float,
+                 indicators: Iterable[str] = (), timestamp: str = '', details: str = '',
+                 rule: str = '', id: Optional[str] = None, saved_at: Optional[str] = None):
+        self.symbol: str = sys.intern(str(symbol))
+        self.action: Action = Action.parse(action)
+        self.price: float = float(price or 0)
+        self.confidence: float = float(confidence or 0)
+        self.indicators: Tuple[str, ...] = tuple(sys.intern(str(i)) for i in indicators)
+        self.timestamp: str = timestamp or ''
+        self.details: str = details or ''
+        self.rule: str = sys.intern(rule) if rule else ''
+        self.id = id
+        self.saved_at = saved_at
+
+    def __repr__(self) -> str:
+        return (f"Signal({self.symbol} {self.action.value} @ {self.price:.2f}, "
+                f"{self.confidence:.1f}%, {', '.join(self.indicators)}, {self.timestamp})")
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Signal):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    # Mutable and compared by value, so not hashable
+    __hash__ = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Signal':
+        """Signal from the English JSON schema (as written by to_dict)"""
+        return cls(data.get('symbol', 'Unknown'), data.get('action', 'buy'),
+                   data.get('price', 0), data.get('confidence', 0),
+                   data.get('indicators') or (), data.get('timestamp', ''),
+                   data.get('details', ''), data.get('rule', ''),
+                   data.get('id'), data.get('saved_at'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """English JSON schema"""
+        data = {
+            'symbol': self.symbol,
+            'rule': self.rule,
+            'action': self.action.value,
+            'price': self.price,
+            'confidence': self.confidence,
+            'indicators': list(self.indicators),
+            'timestamp': self.timestamp,
+            'details': self.details
+        }
+        if self.id is not None:
+            data['id'] = self.id
+        if self.saved_at is not None:
+            data['saved_at'] = self.saved_at
+        return data
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    def to_api(self) -> Dict[str, Any]:
+        """Portuguese payload of the web API (POST /api/signal)"""
+        return {
+            'ativo': self.symbol,
+            'direcao': self.action.portuguese,
+            # HH:MM of the ISO timestamp
+            'horario': self.timestamp[11:16],
+            'preco': self.price,
+            'confianca': self.confidence,
+            'indicadores': list(self.indicators),
+            'detalhes': self.details
+        }
@@ -0,0 +1,436 @@
+"""
+Signal Rules Module
+Declarative signal rules compiled into vectorized NumPy expressions
+"""
+
+import ast
+import logging
+import string
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Set, Tuple
+import numpy as np
+
+from .indicator_plan import IndicatorPlan
+from .market_simulator import OHLCV_COLUMNS
+from .signal_record import Signal
+
+# Built-in rules. Each rule is a list of entries; within a rule the first
+# matching entry wins on a bar, like an if/elif chain. Expressions may use
+# indicator columns, rule parameters (see rule_params), numbers, arithmetic,
+# comparisons, and/or/not and the functions in _FUNCTIONS. Templates are
+# str.format strings over the same names, with `prev.<name>` for the value
+# one bar earlier.
+DEFAULT_RULES = {
+    'rsi': [
+        {
+            'action': 'buy',
+            'when': 'crosses_above(rsi, rsi_oversold)',
+            'confidence': 'min(95, 70 + (rsi_oversold - prev(rsi)))',
+            'indicator': 'RSI Oversold Recovery',
+            'details': 'RSI: {rsi:.1f} (was {prev.rsi:.1f})',
+        },
+        {
+            'action': 'sell',
+            'when': 'crosses_below(rsi, rsi_overbought)',
+            'confidence': 'min(95, 70 + (prev(rsi) - rsi_overbought))',
+            'indicator': 'RSI Overbought Decline',
+            'details': 'RSI: {rsi:.1f} (was {prev.rsi:.1f})',
+        },
+    ],
+    'ma_crossover': [
+        {
+            'action': 'buy',
+            'when': 'crosses_above(fast_ma, slow_ma)',
+            'confidence': 75.0,
+            'indicator': 'Golden Cross (SMA{fast}/SMA{slow})',
+            'details': 'Fast MA: {fast_ma:.2f}, Slow MA: {slow_ma:.2f}',
+        },
+        {
+            'action': 'sell',
+            'when': 'crosses_below(fast_ma, slow_ma)',
+            'confidence': 75.0,
+            'indicator': 'Death Cross (SMA{fast}/SMA{slow})',
+            'details': 'Fast MA: {fast_ma:.2f}, Slow MA: {slow_ma:.2f}',
+        },
+    ],
+    'macd': [
+        {
+            'action': 'buy',
+            'when': 'crosses_above(macd, macd_signal) and macd < 0',
+            'confidence': 80.0,
+            'indicator': 'MACD Bullish Crossover',
+            'details': 'MACD: {macd:.4f}, Signal: {macd_signal:.4f}',
+        },
+        {
+            'action': 'sell',
+            'when': 'crosses_below(macd, macd_signal) and macd > 0',
+            'confidence': 80.0,
+            'indicator': 'MACD Bearish Crossover',
+            'details': 'MACD: {macd:.4f}, Signal: {macd_signal:.4f}',
+        },
+    ],
+    'bollinger': [
+        {
+            'action': 'buy',
+            'when': 'prev(close) <= prev(bb_lower) and close > bb_lower',
+            'confidence': 70.0,
+            'indicator': 'Bollinger Band Bounce (Lower)',
+            'details': 'Price: {close:.2f}, Lower Band: {bb_lower:.2f}',
+        },
+        {
+            'action': 'sell',
+            'when': 'prev(close) >= prev(bb_upper) and close < bb_upper',
+            'confidence': 70.0,
+            'indicator': 'Bollinger Band Bounce (Upper)',
+            'details': 'Price: {close:.2f}, Upper Band: {bb_upper:.2f}',
+        },
+    ],
+}
+
+ACTIONS = ('buy', 'sell')
+
+
+def rule_params(config: Any) -> Dict[str, Any]:
+    """
+    Names available to rule expressions besides indicator columns
+    String values are aliases for columns (fast_ma -> 'sma_20').
+    """
+    indicators = config.indicators
+    params = {
+        'rsi_oversold': indicators.rsi_oversold,
+        'rsi_overbought': indicators.rsi_overbought,
+    }
+    if len(indicators.sma_periods) >= 2:
+        fast, slow = indicators.sma_periods[:2]
+        params.update(fast=fast, slow=slow, fast_ma=f'sma_{fast}', slow_ma=f'sma_{slow}')
+    return params
+
+
+def _shift(x: np.ndarray, lag: int) -> np.ndarray:
+    """x delayed by `lag` bars along the last axis, NaN-padded"""
+    if lag == 0:
+        return x
+    out = np.full(x.shape, np.nan)
+    if lag < x.shape[-1]:
+        out[..., lag:] = x[..., :-lag]
+    return out
+
+
+class _Columns:
+    """Indicator arrays with memoized lagged copies"""
+
+    def __init__(self, columns: Mapping[str, np.ndarray]):
+        self.columns = columns
+        self._lagged: Dict[Tuple[str, int], np.ndarray] = {}
+
+    def get(self, name: str, lag: int) -> np.ndarray:
+        key = (name, lag)
+        if key not in self._lagged:
+            self._lagged[key] = _shift(np.asarray(self.columns[name], dtype=np.float64), lag)
+        return self._lagged[key]
+
+
+Evaluator = Callable[[_Columns, int], Any]
+
+
+def _crosses(op_before, op_now):
+    def evaluate(args: List[Evaluator], frame: _Columns, lag: int):
+        a, b = args
+        return (op_before(a(frame, lag + 1), b(frame, lag + 1))
+                & op_now(a(frame, lag), b(frame, lag)))
+    return evaluate
+
+
+_FUNCTIONS = {
+    'crosses_above': _crosses(np.less_equal, np.greater),
+    'crosses_below': _crosses(np.greater_equal, np.less),
+    'min': lambda args, frame, lag: np.minimum(*(arg(frame, lag) for arg in args)),
+    'max': lambda args, frame, lag: np.maximum(*(arg(frame, lag) for arg in args)),
+    'abs': lambda args, frame, lag: np.abs(args[0](frame, lag)),
+}
+
+_BINARY = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide}
+_COMPARE = {ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater,
+            ast.GtE: np.greater_equal, ast.Eq: np.equal, ast.NotEq: np.not_equal}
+
+
+class Expression:
+    """
+    A rule expression compiled into a tree of NumPy operations
+
+    The source is parsed once with `ast`; evaluate() runs the tree over
+    whole indicator arrays of any shape (bars, or symbols x bars), so one
+    call scores every bar. `columns` lists the indicator columns read and
+    `max_lag` how many earlier bars the expression looks at.
+    """
+
+    def __init__(self, source: Any, params: Mapping[str, Any] = None):
+        self.source = str(source)
+        self.params = dict(params or {})
+        self.columns: Set[str] = set()
+        self.max_lag = 0
+        try:
+            tree = ast.parse(self.source.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid rule expression {self.source!r}: {e.msg}")
+        self._evaluate = self._compile(tree.body, 0)
+
+    def evaluate(self, columns: Mapping[str, np.ndarray]):
+        """Evaluate over indicator arrays; pass a _Columns to share lagged copies"""
+        frame = columns if isinstance(columns, _Columns) else _Columns(columns)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._evaluate(frame, 0)
+
+    def _compile(self, node: ast.AST, depth: int) -> Evaluator:
+        """Compile a node; `depth` tracks the static prev() nesting for max_lag"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+                and not isinstance(node.value, bool):
+            value = float(node.value)
+            return lambda frame, lag: value
+
+        if isinstance(node, ast.Name):
+            return self._compile_name(node.id, depth)
+
+        if isinstance(node, ast.BoolOp):
+            parts = [self._compile(value, depth) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+
+            def evaluate_bool(frame, lag):
+                result = parts[0](frame, lag)
+                for part in parts[1:]:
+                    result = combine(result, part(frame, lag))
+                return result
+            return evaluate_bool
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._compile(node.operand, depth)
+            if isinstance(node.op, ast.Not):
+                return lambda frame, lag: np.logical_not(operand(frame, lag))
+            if isinstance(node.op, ast.USub):
+                return lambda frame, lag: np.negative(operand(frame, lag))
+            if isinstance(node.op, ast.UAdd):
+                return operand
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            op = _BINARY[type(node.op)]
+            left = self._compile(node.left, depth)
+            right = self._compile(node.right, depth)
+            return lambda frame, lag: op(left(frame, lag), right(frame, lag))
+
+        if isinstance(node, ast.Compare) and all(type(op) in _COMPARE for op in node.ops):
+            operands = [self._compile(node.left, depth)] + [self._compile(c, depth) for c in node.comparators]
+            ops = [_COMPARE[type(op)] for op in node.ops]
+
+            def evaluate_compare(frame, lag):
+                values = [operand(frame, lag) for operand in operands]
+                result = ops[0](values[0], values[1])
+                for i in range(1, len(ops)):
+                    result = result & ops[i](values[i], values[i + 1])
+                return result
+            return evaluate_compare
+
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and not node.keywords:
+            return self._compile_call(node.func.id, node.args, depth)
+
+        raise ValueError(f"Unsupported syntax in rule expression {self.source!r}: {ast.dump(node)}")
+
+    def _compile_name(self, name: str, depth: int) -> Evaluator:
+        if name in self.params and not isinstance(self.params[name], str):
+            value = float(self.params[name])
+            return lambda frame, lag: value
+        column = self.params.get(name, name)
+        self.columns.add(column)
+        self.max_lag = max(self.max_lag, depth)
+        return lambda frame, lag: frame.get(column, lag)
+
+    def _compile_call(self, name: str, args: List[ast.AST], depth: int) -> Evaluator:
+        if name == 'prev':
+            bars = 1
+            if len(args) == 2 and isinstance(args[1], ast.Constant) and isinstance(args[1].value, int):
+                bars = args[1].value
+            elif len(args) != 1:
+                raise ValueError(f"prev() takes an expression and an optional bar count: {self.source!r}")
+            inner = self._compile(args[0], depth + bars)
+            return lambda frame, lag: inner(frame, lag + bars)
+
+        if name not in _FUNCTIONS:
+            raise ValueError(f"Unknown function {name}() in rule expression {self.source!r}")
+        if name.startswith('crosses_') and len(args) != 2:
+            raise ValueError(f"{name}() takes two arguments: {self.source!r}")
+        # Crossings also read their arguments one bar back
+        arg_depth = depth + 1 if name.startswith('crosses_') else depth
+        compiled = [self._compile(arg, arg_depth) for arg in args]
+        function = _FUNCTIONS[name]
+        return lambda frame, lag: function(compiled, frame, lag)
+
+
+class _BarValues:
+    """str.format_map context resolving names to values at one bar"""
+
+    def __init__(self, frame: _Columns, params: Mapping[str, Any], index, lag: int = 0):
+        self._frame = frame
+        self._params = params
+        self._index = index
+        self._lag = lag
+
+    def __getitem__(self, name: str):
+        if name == 'prev':
+            return _BarValues(self._frame, self._params, self._index, self._lag + 1)
+        return self._resolve(name)
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self._resolve(name)
+
+    def _resolve(self, name: str):
+        value = self._params.get(name, name)
+        if name in self._params and not isinstance(value, str):
+            return value
+        return float(self._frame.get(value, self._lag)[self._index])
+
+
+class SignalRule:
+    """One entry of a rule: an action with its condition and confidence"""
+
+    def __init__(self, name: str, definition: Mapping[str, Any], params: Mapping[str, Any]):
+        self.name = name
+        self.action = definition['action']
+        if self.action not in ACTIONS:
+            raise ValueError(f"Rule {name}: unknown action {self.action!r}")
+        self.params = params
+        self.when = Expression(definition['when'], params)
+        self.confidence = Expression(definition.get('confidence', 70.0), params)
+        self.indicator = definition.get('indicator', name)
+        self.details = definition.get('details', '')
+
+        self.columns = self.when.columns | self.confidence.columns
+        self.max_lag = max(self.when.max_lag, self.confidence.max_lag)
+        for template in (self.indicator, self.details):
+            for field in _template_fields(template):
+                lag = 1 if field.startswith('prev.') else 0
+                field = field[5:] if lag else field
+                if field in params and not isinstance(params[field], str):
+                    continue
+                self.columns.add(params.get(field, field))
+                self.max_lag = max(self.max_lag, lag)
+
+    def describe(self, frame: _Columns, index) -> Tuple[str, str]:
+        """Indicator label and details text at one bar"""
+        values = _BarValues(frame, self.params, index)
+        return self.indicator.format_map(values), self.details.format_map(values)
+
+
+def _template_fields(template: str) -> Iterable[str]:
+    for _, field, _, _ in string.Formatter().parse(template):
+        if field:
+            yield field
+
+
+class RuleMatch:
+    """Where one rule entry fired, as boolean and confidence arrays"""
+
+    __slots__ = ('rule', 'mask', 'confidence')
+
+    def __init__(self, rule: SignalRule, mask: np.ndarray, confidence: np.ndarray):
+        self.rule = rule
+        self.mask = mask
+        self.confidence = confidence
+
+
+class RuleSet:
+    """
+    Compiled set of enabled signal rules
+
+    evaluate() scores every bar of a single symbol (arrays of shape
+    (bars,)) or of a whole panel (symbols x bars) in one pass; signals()
+    turns the matches into the Signal records sent to notifications. The live
+    bot evaluates only the last max_lag + 1 bars, historical analysis the
+    whole series, both from the same definitions.
+    """
+
+    def __init__(self, names: Iterable[str], params: Mapping[str, Any],
+                 definitions: Mapping[str, List[Mapping[str, Any]]] = None,
+                 available_columns: Iterable[str] = None):
+        self.logger = logging.getLogger(__name__)
+        available = dict(DEFAULT_RULES)
+        available.update(definitions or {})
+
+        self.rules: List[List[SignalRule]] = []
+        for name in names:
+            if name not in available:
+                self.logger.warning(f"Unknown signal rule: {name}")
+                continue
+            try:
+                group = [SignalRule(name, entry, params) for entry in available[name]]
+            except (KeyError, ValueError) as e:
+                self.logger.warning(f"Skipping signal rule {name}: {str(e)}")
+                continue
+            if available_columns is not None:
+                unknown = sorted(set().union(*(rule.columns for rule in group)) - set(available_columns))
+                if unknown:
+                    self.logger.warning(f"Skipping signal rule {name}: columns not available: {', '.join(unknown)}")
+                    continue
+            self.rules.append(group)
+
+        entries = [rule for group in self.rules for rule in group]
+        # signals() always reports the close price
+        self.columns = sorted(set().union({'close'}, *(rule.columns for rule in entries)))
+        self.max_lag = max((rule.max_lag for rule in entries), default=0)
+
+    @classmethod
+    def from_config(cls, config: Any, available_columns: Iterable[str] = None) -> 'RuleSet':
+        """
+        Rules enabled in config, skipping any that read columns outside
+        available_columns (default: what the indicator plan can produce)
+        """
+        if available_columns is None:
+            available_columns = set(OHLCV_COLUMNS) | IndicatorPlan([], config).available_columns
+        return cls(config.signals.rules, rule_params(config), config.signals.definitions, available_columns)
+
+    def evaluate(self, columns: Mapping[str, np.ndarray]) -> List[RuleMatch]:
+        """Evaluate every enabled rule over the whole arrays"""
+        frame = columns if isinstance(columns, _Columns) else _Columns(columns)
+        matches = []
+        for group in self.rules:
+            taken = None
+            for rule in group:
+                mask = np.asarray(rule.when.evaluate(frame), dtype=bool)
+                if taken is not None:
+                    mask = mask & ~taken
+                taken = mask if taken is None else taken | mask
+                confidence = np.broadcast_to(rule.confidence.evaluate(frame), mask.shape)
+                matches.append(RuleMatch(rule, mask, confidence))
+        return matches
+
+    def signals(self, symbol: str, columns: Mapping[str, np.ndarray], timestamps=None,
+                start: int = 0, last_only: bool = False) -> List[Signal]:
+        """
+        Signal records for one symbol's (bars,) arrays
+
+        Args:
+            timestamps: Per-bar timestamps, or a single timestamp string used for every signal
+            start: First bar position allowed to produce signals
+            last_only: Only report signals on the last bar
+        """
+        frame = _Columns(columns)
+        matches = self.evaluate(frame)
+        if not matches:
+            return []
+
+        found = []
+        for order, match in enumerate(matches):
+            positions = np.flatnonzero(match.mask[-1:]) + len(match.mask) - 1 if last_only \
+                else np.flatnonzero(match.mask[start:]) + start
+            found.extend((position, order) for position in positions)
+        found.sort()
+
+        signals = []
+        close = frame.get('close', 0)
+        for position, order in found:
+            match = matches[order]
+            indicator, details = match.rule.describe(frame, position)
+            timestamp = timestamps if timestamps is None or isinstance(timestamps, str) \
+                else timestamps[position].isoformat()
+            signals.append(Signal(symbol, match.rule.action, close[position], match.confidence[position],
+                                  (indicator,), timestamp, details, match.rule.name))
+        return signals
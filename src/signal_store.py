@@ -0,0 +1,663 @@
+"""
+Signal Store Module
+Storage backends behind SignalHistory: an append-only JSONL log and SQLite
+"""
+
+import bisect
+import json
+import os
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from collections import Counter
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .signal_record import Action, Signal
+
+
+def _epoch(timestamp: Optional[str]) -> float:
+    """Epoch seconds of an ISO timestamp; signals without one sort first"""
+    if not timestamp:
+        return float('-inf')
+    return datetime.fromisoformat(timestamp).timestamp()
+
+
+def _next_midnight(moment: datetime) -> float:
+    """Epoch seconds of the local midnight after moment"""
+    return datetime.combine(moment.date() + timedelta(days=1), datetime.min.time()).timestamp()
+
+
+# (epoch seconds, insertion sequence): unique and in time order
+SortKey = Tuple[float, int]
+
+
+class SignalStats:
+    """
+    Signal counts by action and symbol plus the confidence sum and count
+
+    Used both as the per-day rollup buckets of a store and as the combined
+    result of a stats query. Zero confidences are not counted, matching
+    the average reported by SignalHistory.get_signal_stats.
+    """
+
+    __slots__ = ('total', 'actions', 'symbols', 'confidence_sum', 'confidence_count')
+
+    def __init__(self):
+        self.total = 0
+        self.actions: Counter = Counter()
+        self.symbols: Counter = Counter()
+        self.confidence_sum = 0.0
+        self.confidence_count = 0
+
+    def add(self, action: Action, symbol: str, count: int = 1, confidence_sum: float = 0.0,
+            confidence_count: int = 0):
+        """Add (or with negative counts, retire) signals of one action and symbol"""
+        self.total += count
+        self.actions[action] += count
+        self.symbols[symbol] += count
+        if self.actions[action] <= 0:
+            del self.actions[action]
+        if self.symbols[symbol] <= 0:
+            del self.symbols[symbol]
+        self.confidence_sum += confidence_sum
+        self.confidence_count += confidence_count
+        if not self.confidence_count:
+            # Do not carry rounding left over from retired signals
+            self.confidence_sum = 0.0
+
+    def add_signal(self, signal: Signal, sign: int = 1):
+        counted = 1 if signal.confidence else 0
+        self.add(signal.action, signal.symbol, sign, sign * signal.confidence, sign * counted)
+
+    def merge(self, other: 'SignalStats'):
+        self.total += other.total
+        self.actions.update(other.actions)
+        self.symbols.update(other.symbols)
+        self.confidence_sum += other.confidence_sum
+        self.confidence_count += other.confidence_count
+
+
+class _TimeIndex:
+    """Signals in time order, with their sort keys in a parallel list for bisect"""
+
+    __slots__ = ('keys', 'signals')
+
+    def __init__(self):
+        self.keys: List[SortKey] = []
+        self.signals: List[Signal] = []
+
+    def __len__(self) -> int:
+        return len(self.signals)
+
+    def insert(self, key: SortKey, signal: Signal):
+        if not self.keys or key > self.keys[-1]:
+            self.keys.append(key)
+            self.signals.append(signal)
+        else:
+            position = bisect.bisect(self.keys, key)
+            self.keys.insert(position, key)
+            self.signals.insert(position, signal)
+
+    def drop_before(self, key: SortKey) -> Tuple[List[SortKey], List[Signal]]:
+        """Remove and return the keys and signals sorting before key"""
+        position = bisect.bisect_left(self.keys, key)
+        dropped = self.keys[:position], self.signals[:position]
+        del self.keys[:position]
+        del self.signals[:position]
+        return dropped
+
+    def newest(self, since: float = None, limit: int = None, symbol: str = None,
+               action: Action = None) -> List[Signal]:
+        """Signals at or after `since`, newest first, optionally filtered by symbol/action"""
+        start = bisect.bisect_left(self.keys, (since,)) if since is not None else 0
+        stop = len(self.signals)
+        if symbol is None and action is None:
+            if limit:
+                start = max(start, stop - limit)
+            return self.signals[start:stop][::-1]
+
+        found = []
+        for position in range(stop - 1, start - 1, -1):
+            signal = self.signals[position]
+            if (symbol is None or signal.symbol == symbol) and (action is None or signal.action is action):
+                found.append(signal)
+                if limit and len(found) >= limit:
+                    break
+        return found
+
+
+class JsonlSignalStore:
+    """
+    In-memory signals backed by an append-only JSONL log
+
+    Signals are kept in memory as Signal records and stored with one
+    to_dict() JSON object per line: add() appends a single line, so its
+    cost does not grow with the history, and a crash can at worst leave a
+    truncated last line, which is skipped on load. A background thread
+    compacts the log to the retained signals (the newest max_signals, no
+    older than max_age_days) by writing a temp file and renaming it over
+    the log, once max_signals lines have been appended or every
+    compact_interval seconds.
+
+    durability sets what add_many() waits for: "buffered" hands the lines
+    to the OS, "fsync" also syncs them to disk, and "atomic" rewrites the
+    log through a temp file, fsync and rename instead of appending, so the
+    file on disk is never even partially written (at O(max_signals) cost).
+
+    In memory, signals are held in time order with their timestamps parsed
+    once into epoch seconds, plus one such list per symbol and per action.
+    A query bisects the smallest matching list to the start of its date
+    range and walks back from the newest signal until `limit` is reached.
+    Statistics are rolled up per local day as signals are added and
+    retired, so stats() for the last N days merges at most N buckets.
+    """
+
+    DURABILITY = ('buffered', 'fsync', 'atomic')
+
+    def __init__(self, path: str, max_signals: int = 1000, max_age_days: Optional[float] = None,
+                 compact_interval: float = 300.0, durability: str = 'buffered'):
+        if durability not in self.DURABILITY:
+            raise ValueError(f"Unsupported history durability: {durability}")
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.max_signals = max_signals
+        self.max_age_days = max_age_days
+        self.compact_interval = compact_interval
+        self.durability = durability
+
+        self._lock = threading.RLock()
+        self._log = None
+        self._appended = 0
+        self._wake = threading.Event()
+        self._compactor: threading.Thread = None
+        self._sequence = 0
+        self._all = _TimeIndex()
+        self._by_symbol: Dict[str, _TimeIndex] = {}
+        self._by_action: Dict[Action, _TimeIndex] = {}
+        self._daily: Dict[int, SignalStats] = {}
+        self._days: List[int] = []
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    @property
+    def signals(self) -> List[Signal]:
+        """Retained signals, oldest first"""
+        return self._all.signals
+
+    def _read_log(self, path: str) -> Iterator[Dict[str, Any]]:
+        """Stream the signal dicts of a log file (or of a legacy JSON array file)"""
+        with open(path, 'r') as f:
+            first = f.read(1)
+            f.seek(0)
+            if first == '[':
+                yield from json.load(f)
+                return
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    self.logger.warning(f"Skipping unreadable line {number} of {path}")
+
+    def _load(self):
+        path = self.path
+        legacy = path[:-1] if path.endswith('.jsonl') else None
+        if not os.path.exists(path) and legacy and os.path.exists(legacy):
+            # JSON array written by earlier versions; converted below
+            path = legacy
+        if not os.path.exists(path):
+            self.logger.info(f"History file {self.path} not found, starting with empty history")
+            return
+
+        try:
+            signals = []
+            count = 0
+            for count, data in enumerate(self._read_log(path), 1):
+                signals.append(Signal.from_dict(data))
+                if len(signals) > 2 * self.max_signals:
+                    del signals[:-self.max_signals]
+            for signal in signals:
+                self._insert(signal)
+            self._enforce_limits()
+            self.logger.info(f"Loaded {len(self)} signals from history")
+        except Exception as e:
+            self.logger.error(f"Error loading signal history: {str(e)}")
+            self._all, self._by_symbol, self._by_action = _TimeIndex(), {}, {}
+            self._daily, self._days = {}, []
+            return
+
+        if path != self.path:
+            self._compact()
+        else:
+            self._appended = count - len(self)
+
+    def _insert(self, signal: Signal):
+        key = (_epoch(signal.timestamp), self._sequence)
+        self._sequence += 1
+        self._all.insert(key, signal)
+        self._by_symbol.setdefault(signal.symbol, _TimeIndex()).insert(key, signal)
+        self._by_action.setdefault(signal.action, _TimeIndex()).insert(key, signal)
+        self._roll_up(key[0], signal, 1)
+
+    def _roll_up(self, epoch: float, signal: Signal, sign: int):
+        """Add a signal to (sign=1) or retire it from (sign=-1) its day's bucket"""
+        if epoch == float('-inf'):
+            return
+        day = datetime.fromtimestamp(epoch).toordinal()
+        stats = self._daily.get(day)
+        if stats is None:
+            stats = self._daily[day] = SignalStats()
+            bisect.insort(self._days, day)
+        stats.add_signal(signal, sign)
+        if not stats.total:
+            del self._daily[day]
+            del self._days[bisect.bisect_left(self._days, day)]
+
+    def _drop_before(self, key: SortKey) -> List[Signal]:
+        """Remove the signals sorting before key from every index"""
+        keys, dropped = self._all.drop_before(key)
+        for (epoch, _), signal in zip(keys, dropped):
+            self._roll_up(epoch, signal, -1)
+        for indexes, names in ((self._by_symbol, {s.symbol for s in dropped}),
+                               (self._by_action, {s.action for s in dropped})):
+            for name in names:
+                indexes[name].drop_before(key)
+                if not indexes[name]:
+                    del indexes[name]
+        return dropped
+
+    def _enforce_limits(self) -> List[Signal]:
+        """Drop the signals beyond max_signals or older than max_age_days"""
+        dropped = []
+        if len(self._all) > self.max_signals:
+            dropped += self._drop_before(self._all.keys[len(self._all) - self.max_signals])
+        if self.max_age_days:
+            cutoff = (datetime.now() - timedelta(days=self.max_age_days)).timestamp()
+            dropped += self._drop_before((cutoff,))
+        return dropped
+
+    def _append(self, signals: List[Signal]):
+        """Write the signals' lines to the log with one write"""
+        if self._log is None:
+            self._log = open(self.path, 'a')
+            # Keep a line left truncated by a crash from swallowing this one
+            if self._log.tell() > 0:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self._log.write('\n')
+        self._log.write(''.join(signal.to_json() + '\n' for signal in signals))
+        self._log.flush()
+        if self.durability == 'fsync':
+            os.fsync(self._log.fileno())
+        self._appended += len(signals)
+
+    def _rewrite(self, pending: List[Signal] = ()):
+        """Replace the log with the retained plus pending signals (temp file, fsync, atomic rename)"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.writelines(signal.to_json() + '\n' for signal in chain(self.signals, pending))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        if self._log is not None:
+            # The handle still points at the replaced file
+            self._log.close()
+            self._log = None
+        self._appended = 0
+
+    def _compact(self):
+        """Rewrite the log with the retained signals"""
+        with self._lock:
+            self._enforce_limits()
+            try:
+                self._rewrite()
+            except Exception as e:
+                self.logger.error(f"Error compacting signal history: {str(e)}")
+                return
+            self.logger.debug(f"Compacted signal history to {len(self)} signals")
+
+    def _run_compactor(self):
+        while True:
+            self._wake.wait(self.compact_interval)
+            self._wake.clear()
+            if self._appended:
+                self._compact()
+
+    def _start_compactor(self):
+        """Start the background compaction thread on the first add"""
+        if self._compactor is None:
+            self._compactor = threading.Thread(target=self._run_compactor, name='signal-history-compactor',
+                                               daemon=True)
+            self._compactor.start()
+
+    def add(self, signal: Signal):
+        self.add_many([signal])
+
+    def add_many(self, signals: List[Signal]):
+        """
+        Store signals with a single write to the log
+        They are indexed only once the write succeeded, so a failed write
+        raises without leaving memory ahead of the file.
+        """
+        with self._lock:
+            if self.durability == 'atomic':
+                self._enforce_limits()
+                self._rewrite(signals)
+            else:
+                self._append(signals)
+
+            # Keep the newest max_signals in memory; the log is trimmed by compaction
+            for signal in signals:
+                self._insert(signal)
+            if len(self._all) > self.max_signals:
+                self._drop_before(self._all.keys[len(self._all) - self.max_signals])
+            if self.durability == 'atomic':
+                return
+
+        self._start_compactor()
+        if self._appended >= self.max_signals:
+            self._wake.set()
+
+    def query(self, symbol: str = None, action: Action = None, since: datetime = None,
+              limit: int = None) -> List[Signal]:
+        """Matching signals, newest first"""
+        with self._lock:
+            symbol_index = self._by_symbol.get(symbol) if symbol else None
+            action_index = self._by_action.get(action) if action else None
+            if (symbol and symbol_index is None) or (action and action_index is None):
+                return []
+
+            # Walk the smallest list that covers the filters
+            index = symbol_index if symbol_index is not None else self._all
+            if action_index is not None and len(action_index) < len(index):
+                index = action_index
+            return index.newest(since.timestamp() if since else None, limit,
+                                symbol if index is not symbol_index else None,
+                                action if index is not action_index else None)
+
+    def iter_signals(self, since: datetime = None, chunk_size: int = 1000) -> Iterator[Signal]:
+        """
+        Signals at or after since, oldest first
+        Read chunk_size at a time under the lock, resuming after the last key
+        returned, so saves can go on while a long export is streaming.
+        """
+        keys, signals = self._all.keys, self._all.signals
+        with self._lock:
+            start = bisect.bisect_left(keys, (since.timestamp(),)) if since else 0
+        while True:
+            with self._lock:
+                chunk = signals[start:start + chunk_size]
+                if chunk:
+                    last_key = keys[start + len(chunk) - 1]
+            if not chunk:
+                return
+            yield from chunk
+            with self._lock:
+                start = bisect.bisect_right(keys, last_key)
+
+    def stats(self, since: datetime = None) -> SignalStats:
+        """Statistics of the signals at or after since (all signals when None)"""
+        with self._lock:
+            result = SignalStats()
+            first_day = 0
+            if since is not None:
+                # The day `since` falls in only counts from `since` on
+                keys, signals = self._all.keys, self._all.signals
+                position = bisect.bisect_left(keys, (since.timestamp(),))
+                day_end = _next_midnight(since)
+                while position < len(keys) and keys[position][0] < day_end:
+                    result.add_signal(signals[position])
+                    position += 1
+                first_day = bisect.bisect_right(self._days, since.toordinal())
+            for day in self._days[first_day:]:
+                result.merge(self._daily[day])
+            return result
+
+    def delete_before(self, cutoff: datetime) -> int:
+        """Delete signals older than cutoff; returns how many were deleted"""
+        with self._lock:
+            deleted_count = len(self._drop_before((cutoff.timestamp(),)))
+            if deleted_count > 0:
+                self._compact()
+        return deleted_count
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+def _micros(timestamp: Optional[str]) -> Optional[int]:
+    """Integer epoch microseconds of an ISO timestamp"""
+    if not timestamp:
+        return None
+    return round(datetime.fromisoformat(timestamp).timestamp() * 1_000_000)
+
+
+def _iso(micros: Optional[int]) -> str:
+    if micros is None:
+        return ''
+    return datetime.fromtimestamp(micros / 1_000_000).isoformat()
+
+
+class SqliteSignalStore:
+    """
+    Signals in an indexed SQLite table
+
+    Timestamps are stored as integer epoch microseconds with indexes on
+    (symbol, ts), (action, ts) and ts, so filtered, newest-first queries
+    with a limit read only the rows they return instead of the whole
+    history, and nothing has to be kept in memory or capped. The database
+    runs in WAL mode, so the web app can read while the bot writes.
+    add_many() inserts a batch in one transaction; durability "buffered"
+    runs with synchronous=NORMAL (a commit survives a crash of the bot but
+    may be lost on power failure), "fsync" and "atomic" with FULL.
+
+    Triggers keep signal_daily, a rollup of counts and confidence sums per
+    local day, symbol and action, in step with every insert and delete, so
+    stats() reads at most one row per day and symbol/action pair plus the
+    signals of the partial first day.
+    """
+
+    COLUMNS = 'signal_id, symbol, rule, action, price, confidence, indicators, ts, details, saved_at'
+
+    def __init__(self, path: str, max_age_days: Optional[float] = None, durability: str = 'buffered'):
+        if durability not in JsonlSignalStore.DURABILITY:
+            raise ValueError(f"Unsupported history durability: {durability}")
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(f"PRAGMA synchronous={'NORMAL' if durability == 'buffered' else 'FULL'}")
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS signals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                signal_id TEXT,
+                symbol TEXT NOT NULL,
+                rule TEXT,
+                action TEXT NOT NULL,
+                price REAL,
+                confidence REAL,
+                indicators TEXT,
+                ts INTEGER,
+                details TEXT,
+                saved_at INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS signals_symbol_ts ON signals (symbol, ts);
+            CREATE INDEX IF NOT EXISTS signals_action_ts ON signals (action, ts);
+            CREATE INDEX IF NOT EXISTS signals_ts ON signals (ts);
+        ''')
+        self._create_rollup()
+        if max_age_days:
+            self.delete_before(datetime.now() - timedelta(days=max_age_days))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM signals').fetchone()[0]
+
+    def _create_rollup(self):
+        day = "date({row}.ts / 1000000, 'unixepoch', 'localtime')"
+        created = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'signal_daily'").fetchone() is None
+        self._conn.executescript(f'''
+            CREATE TABLE IF NOT EXISTS signal_daily (
+                day TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                action TEXT NOT NULL,
+                signals INTEGER NOT NULL,
+                confidence_sum REAL NOT NULL,
+                confidence_count INTEGER NOT NULL,
+                PRIMARY KEY (day, symbol, action)
+            );
+            CREATE TRIGGER IF NOT EXISTS signals_rollup_insert AFTER INSERT ON signals
+            WHEN NEW.ts IS NOT NULL BEGIN
+                INSERT INTO signal_daily VALUES ({day.format(row='NEW')}, NEW.symbol, NEW.action, 1,
+                    COALESCE(NEW.confidence, 0), COALESCE(NEW.confidence, 0) != 0)
+                ON CONFLICT (day, symbol, action) DO UPDATE SET
+                    signals = signals + 1,
+                    confidence_sum = confidence_sum + excluded.confidence_sum,
+                    confidence_count = confidence_count + excluded.confidence_count;
+            END;
+            CREATE TRIGGER IF NOT EXISTS signals_rollup_delete AFTER DELETE ON signals
+            WHEN OLD.ts IS NOT NULL BEGIN
+                UPDATE signal_daily SET
+                    signals = signals - 1,
+                    confidence_sum = confidence_sum - COALESCE(OLD.confidence, 0),
+                    confidence_count = confidence_count - (COALESCE(OLD.confidence, 0) != 0)
+                WHERE day = {day.format(row='OLD')} AND symbol = OLD.symbol AND action = OLD.action;
+                DELETE FROM signal_daily
+                WHERE day = {day.format(row='OLD')} AND symbol = OLD.symbol AND action = OLD.action
+                    AND signals <= 0;
+            END;
+        ''')
+        if created:
+            # Databases from before the rollup existed
+            self._conn.execute(f'''
+                INSERT INTO signal_daily
+                SELECT {day.format(row='signals')}, symbol, action, COUNT(*), SUM(COALESCE(confidence, 0)),
+                       SUM(COALESCE(confidence, 0) != 0)
+                FROM signals WHERE ts IS NOT NULL GROUP BY 1, 2, 3
+            ''')
+
+    @staticmethod
+    def _signal(row) -> Signal:
+        signal_id, symbol, rule, action, price, confidence, indicators, ts, details, saved_at = row
+        return Signal(symbol, action, price, confidence, json.loads(indicators or '[]'), _iso(ts),
+                      details, rule or '', signal_id, _iso(saved_at) or None)
+
+    def add(self, signal: Signal):
+        self.add_many([signal])
+
+    def add_many(self, signals: List[Signal]):
+        """Insert signals in one transaction"""
+        rows = [(signal.id, signal.symbol, signal.rule, signal.action.value, signal.price, signal.confidence,
+                 json.dumps(signal.indicators), _micros(signal.timestamp), signal.details,
+                 _micros(signal.saved_at)) for signal in signals]
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.executemany(
+                    f'INSERT INTO signals ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+    def query(self, symbol: str = None, action: Action = None, since: datetime = None,
+              limit: int = None) -> List[Signal]:
+        """Matching signals, newest first"""
+        conditions, params = [], []
+        if symbol:
+            conditions.append('symbol = ?')
+            params.append(symbol)
+        if action:
+            conditions.append('action = ?')
+            params.append(action.value)
+        if since:
+            conditions.append('ts >= ?')
+            params.append(_micros(since.isoformat()))
+
+        sql = f'SELECT {self.COLUMNS} FROM signals'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY ts DESC, id DESC'
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._signal(row) for row in rows]
+
+    def iter_signals(self, since: datetime = None, chunk_size: int = 1000) -> Iterator[Signal]:
+        """
+        Signals at or after since, oldest first
+        Paged through the ts index chunk_size rows at a time, each page
+        starting after the (ts, id) of the previous one.
+        """
+        if since is None:
+            # Signals without a timestamp only appear in unfiltered exports
+            last_id = -1
+            while True:
+                with self._lock:
+                    rows = self._conn.execute(
+                        f'SELECT id, ts, {self.COLUMNS} FROM signals WHERE ts IS NULL AND id > ? ORDER BY id LIMIT ?',
+                        (last_id, chunk_size)).fetchall()
+                if not rows:
+                    break
+                yield from (self._signal(row[2:]) for row in rows)
+                last_id = rows[-1][0]
+
+        last_ts, last_id = (_micros(since.isoformat()) if since else -2 ** 63), -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f'SELECT id, ts, {self.COLUMNS} FROM signals WHERE ts >= ? AND (ts > ? OR id > ?) '
+                    f'ORDER BY ts, id LIMIT ?', (last_ts, last_ts, last_id, chunk_size)).fetchall()
+            if not rows:
+                return
+            yield from (self._signal(row[2:]) for row in rows)
+            last_id, last_ts = rows[-1][:2]
+
+    def stats(self, since: datetime = None) -> SignalStats:
+        """Statistics of the signals at or after since (all signals when None)"""
+        result = SignalStats()
+        with self._lock:
+            if since is None:
+                rows = self._conn.execute('''
+                    SELECT action, symbol, SUM(signals), SUM(confidence_sum), SUM(confidence_count)
+                    FROM signal_daily GROUP BY action, symbol
+                ''').fetchall()
+            else:
+                # Rolled-up days after the first one, plus the first day from `since` on
+                rows = self._conn.execute('''
+                    SELECT action, symbol, SUM(signals), SUM(confidence_sum), SUM(confidence_count)
+                    FROM signal_daily WHERE day > ? GROUP BY action, symbol
+                ''', (since.date().isoformat(),)).fetchall()
+                rows += self._conn.execute('''
+                    SELECT action, symbol, COUNT(*), SUM(COALESCE(confidence, 0)),
+                           SUM(COALESCE(confidence, 0) != 0)
+                    FROM signals WHERE ts >= ? AND ts < ? GROUP BY action, symbol
+                ''', (_micros(since.isoformat()), round(_next_midnight(since) * 1_000_000))).fetchall()
+        for action, symbol, count, confidence_sum, confidence_count in rows:
+            result.add(Action(action), symbol, count, confidence_sum, confidence_count)
+        return result
+
+    def delete_before(self, cutoff: datetime) -> int:
+        """Delete signals older than cutoff; returns how many were deleted"""
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM signals WHERE ts < ? OR ts IS NULL',
+                                        (_micros(cutoff.isoformat()),))
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
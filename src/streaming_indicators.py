@@ -0,0 +1,272 @@
+"""
+Streaming Indicators Module
+Constant-time-per-bar versions of the TechnicalIndicators calculations
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Optional, Set
+
+from .market_simulator import OHLCV_COLUMNS
+
+NAN = float('nan')
+
+
+class StreamingSMA:
+    """
+    Simple Moving Average over a running sum
+    Like pandas rolling().mean(), the value is NaN while the window is not
+    full or still contains a NaN input.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window = deque()
+        self._sum = 0.0
+        self._nans = 0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self._window.append(x)
+        if math.isnan(x):
+            self._nans += 1
+        else:
+            self._sum += x
+
+        if len(self._window) > self.period:
+            old = self._window.popleft()
+            if math.isnan(old):
+                self._nans -= 1
+            else:
+                self._sum -= old
+
+        full = len(self._window) == self.period and not self._nans
+        self.value = self._sum / self.period if full else NAN
+        return self.value
+
+
+class StreamingBollingerBands:
+    """
+    Bollinger Bands over a sliding mean and sum of squared deviations
+    Uses the sample standard deviation like pandas rolling().std(). The
+    add/remove update of the mean and M2 avoids the cancellation error of a
+    naive sum-of-squares.
+    """
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.period = period
+        self.std_dev = std_dev
+        self._window = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.upper = self.middle = self.lower = NAN
+
+    def update(self, x: float) -> Dict[str, float]:
+        window = self._window
+        window.append(x)
+
+        if len(window) <= self.period:
+            # Growing window: standard Welford step
+            delta = x - self._mean
+            self._mean += delta / len(window)
+            self._m2 += delta * (x - self._mean)
+        else:
+            old = window.popleft()
+            old_mean = self._mean
+            self._mean += (x - old) / self.period
+            self._m2 += (x - old) * (x - self._mean + old - old_mean)
+
+        if len(window) == self.period:
+            std = math.sqrt(max(self._m2, 0.0) / (self.period - 1))
+            self.middle = self._mean
+            self.upper = self._mean + std * self.std_dev
+            self.lower = self._mean - std * self.std_dev
+
+        return {'upper': self.upper, 'middle': self.middle, 'lower': self.lower}
+
+
+class StreamingEMA:
+    """
+    Exponential Moving Average matching pandas ewm(span=period) (adjust=True)
+    The adjusted average is a ratio of two recursively decayed sums.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._decay = 1.0 - 2.0 / (period + 1.0)
+        self._num = 0.0
+        self._den = 0.0
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        self._num = x + self._decay * self._num
+        self._den = 1.0 + self._decay * self._den
+        self.value = self._num / self._den
+        return self.value
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram from recursive EMAs"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self._fast = StreamingEMA(fast)
+        self._slow = StreamingEMA(slow)
+        self._signal = StreamingEMA(signal)
+        self.macd = self.signal = self.histogram = NAN
+
+    def update(self, x: float) -> Dict[str, float]:
+        self.macd = self._fast.update(x) - self._slow.update(x)
+        self.signal = self._signal.update(self.macd)
+        self.histogram = self.macd - self.signal
+        return {'macd': self.macd, 'signal': self.signal, 'histogram': self.histogram}
+
+
+class StreamingRSI:
+    """
+    Relative Strength Index from running gain/loss averages
+
+    smoothing='sma' reproduces TechnicalIndicators.rsi, which averages gains
+    and losses over a plain rolling window (the first bar counts as a zero
+    change). smoothing='wilder' uses Wilder's recursive average instead,
+    seeded with the first full window.
+    """
+
+    def __init__(self, period: int = 14, smoothing: str = 'sma'):
+        if smoothing not in ('sma', 'wilder'):
+            raise ValueError(f"Unknown RSI smoothing: {smoothing}")
+        self.period = period
+        self.smoothing = smoothing
+        self._gain = StreamingSMA(period)
+        self._loss = StreamingSMA(period)
+        self._avg_gain = NAN
+        self._avg_loss = NAN
+        self._prev: Optional[float] = None
+        self.value = NAN
+
+    def update(self, x: float) -> float:
+        delta = 0.0 if self._prev is None else x - self._prev
+        self._prev = x
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.smoothing == 'wilder' and not math.isnan(self._avg_gain):
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+        else:
+            self._avg_gain = self._gain.update(gain)
+            self._avg_loss = self._loss.update(loss)
+
+        self.value = _rsi(self._avg_gain, self._avg_loss)
+        return self.value
+
+
+class StreamingStochastic:
+    """Stochastic Oscillator with monotonic deques for the rolling low/high"""
+
+    def __init__(self, period: int = 14, smooth: int = 3):
+        self.period = period
+        self._lows = deque()   # (index, low), increasing lows
+        self._highs = deque()  # (index, high), decreasing highs
+        self._index = 0
+        self._d = StreamingSMA(smooth)
+        self.k = self.d = NAN
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        i = self._index
+        self._index += 1
+
+        while self._lows and self._lows[-1][1] >= low:
+            self._lows.pop()
+        self._lows.append((i, low))
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((i, high))
+
+        expired = i - self.period
+        if self._lows[0][0] <= expired:
+            self._lows.popleft()
+        if self._highs[0][0] <= expired:
+            self._highs.popleft()
+
+        if self._index >= self.period:
+            lowest_low = self._lows[0][1]
+            highest_high = self._highs[0][1]
+            price_range = highest_high - lowest_low
+            self.k = 100 * (close - lowest_low) / price_range if price_range else NAN
+            self.d = self._d.update(self.k)
+
+        return {'k': self.k, 'd': self.d}
+
+
+class StreamingIndicatorSet:
+    """
+    Incremental equivalent of TechnicalIndicators.calculate_all_indicators
+
+    update() consumes one bar and returns the latest indicator row using the
+    same column names as the batch DataFrame; the row before it is kept in
+    `previous`, which is all SignalGenerator's rules look at. Only the core
+    indicators are maintained (see available_columns); the optional
+    indicators.extra groups are batch-only.
+    """
+
+    CORE_COLUMNS = ('rsi', 'macd', 'macd_signal', 'macd_histogram', 'bb_upper', 'bb_middle',
+                    'bb_lower', 'stoch_k', 'stoch_d')
+
+    def __init__(self, config: Any):
+        settings = config.indicators
+        self.sma_periods = list(settings.sma_periods)
+        self._smas = {period: StreamingSMA(period) for period in self.sma_periods}
+        self._rsi = StreamingRSI(settings.rsi_period)
+        self._macd = StreamingMACD()
+        self._bollinger = StreamingBollingerBands()
+        self._stochastic = StreamingStochastic()
+        self.count = 0
+        self.latest: Dict[str, float] = {}
+        self.previous: Dict[str, float] = {}
+
+    @classmethod
+    def available_columns(cls, config: Any) -> Set[str]:
+        """Every column of the rows update() returns for this config"""
+        sma_columns = {f'sma_{period}' for period in config.indicators.sma_periods}
+        return set(OHLCV_COLUMNS) | set(cls.CORE_COLUMNS) | sma_columns
+
+    def update(self, open_: float, high: float, low: float, close: float, volume: float = 0.0) -> Dict[str, float]:
+        row = {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+
+        for period, sma in self._smas.items():
+            row[f'sma_{period}'] = sma.update(close)
+
+        row['rsi'] = self._rsi.update(close)
+
+        macd = self._macd.update(close)
+        row['macd'] = macd['macd']
+        row['macd_signal'] = macd['signal']
+        row['macd_histogram'] = macd['histogram']
+
+        bands = self._bollinger.update(close)
+        row['bb_upper'] = bands['upper']
+        row['bb_middle'] = bands['middle']
+        row['bb_lower'] = bands['lower']
+
+        stochastic = self._stochastic.update(high, low, close)
+        row['stoch_k'] = stochastic['k']
+        row['stoch_d'] = stochastic['d']
+
+        self.count += 1
+        self.previous = self.latest
+        self.latest = row
+        return row
+
+    def update_frame(self, df) -> Dict[str, float]:
+        """Feed every bar of an OHLCV DataFrame, e.g. to warm up from history"""
+        for open_, high, low, close, volume in df[OHLCV_COLUMNS].itertuples(index=False):
+            self.update(open_, high, low, close, volume)
+        return self.latest
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    if math.isnan(avg_gain) or math.isnan(avg_loss):
+        return NAN
+    if avg_loss == 0:
+        return NAN if avg_gain == 0 else 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
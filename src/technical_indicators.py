@@ -5,7 +5,10 @@ Implements various technical analysis indicators
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Tuple
+
+from . import indicator_kernels as kernels
+from .indicator_plan import IndicatorPlan
 
 
 class TechnicalIndicators:
@@ -78,34 +81,141 @@ class TechnicalIndicators:
         }
     
     @staticmethod
-    def calculate_all_indicators(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
-        """Calculate all configured indicators for a DataFrame"""
-        result_df = df.copy()
+    def atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
+        """Average True Range (Wilder's smoothing)"""
+        values = kernels.atr(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64),
+                             close.to_numpy(dtype=np.float64), period)
+        return pd.Series(values, index=close.index)
+    
+    @staticmethod
+    def adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> Dict[str, pd.Series]:
+        """Average Directional Index with the +DI/-DI lines (DMI)"""
+        values = kernels.dmi(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64),
+                             close.to_numpy(dtype=np.float64), period)
+        return {name: pd.Series(series, index=close.index) for name, series in values.items()}
+    
+    @staticmethod
+    def vwap(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series, period: int = None) -> pd.Series:
+        """Volume Weighted Average Price, cumulative or over a rolling `period`"""
+        values = kernels.vwap(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64),
+                              close.to_numpy(dtype=np.float64), volume.to_numpy(dtype=np.float64), period)
+        return pd.Series(values, index=close.index)
+    
+    @staticmethod
+    def obv(close: pd.Series, volume: pd.Series) -> pd.Series:
+        """On-Balance Volume"""
+        values = kernels.obv(close.to_numpy(dtype=np.float64), volume.to_numpy(dtype=np.float64))
+        return pd.Series(values, index=close.index)
+    
+    @staticmethod
+    def keltner_channels(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 20,
+                         multiplier: float = 2.0, atr_period: int = 10) -> Dict[str, pd.Series]:
+        """Keltner Channels"""
+        values = kernels.keltner(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64),
+                                 close.to_numpy(dtype=np.float64), period, multiplier, atr_period)
+        return {name: pd.Series(series, index=close.index) for name, series in values.items()}
+    
+    @staticmethod
+    def sma_sweep(data: pd.Series, periods: Iterable[int]) -> pd.DataFrame:
+        """
+        Simple Moving Average for many periods at once
+        Returns a (periods x bars) DataFrame indexed by period; row p equals
+        sma(data, p). All periods share one cumulative-sum pass.
+        """
+        periods = list(periods)
+        values = kernels.rolling_mean_sweep(data.to_numpy(dtype=np.float64), periods)
+        return pd.DataFrame(values, index=pd.Index(periods, name='period'), columns=data.index, copy=False)
+    
+    @staticmethod
+    def rsi_sweep(data: pd.Series, periods: Iterable[int]) -> pd.DataFrame:
+        """Relative Strength Index for many periods at once, as a (periods x bars) DataFrame"""
+        periods = list(periods)
+        values = kernels.rsi_sweep(data.to_numpy(dtype=np.float64), periods)
+        return pd.DataFrame(values, index=pd.Index(periods, name='period'), columns=data.index, copy=False)
+    
+    @staticmethod
+    def bollinger_sweep(data: pd.Series, periods: Iterable[int], std_dev: float = 2) -> Dict[str, pd.DataFrame]:
+        """
+        Bollinger Bands for many periods at once
+        Returns 'upper', 'middle' and 'lower' (periods x bars) DataFrames
+        from one cumulative-sum and one cumulative-squares pass.
+        """
+        periods = list(periods)
+        values = data.to_numpy(dtype=np.float64)
+        middle = kernels.rolling_mean_sweep(values, periods)
+        width = kernels.rolling_std_sweep(values, periods)
+        width *= std_dev
+        
+        index = pd.Index(periods, name='period')
+        bands = {'upper': middle + width, 'middle': middle, 'lower': middle - width}
+        return {name: pd.DataFrame(band, index=index, columns=data.index, copy=False)
+                for name, band in bands.items()}
+    
+    @staticmethod
+    def calculate_all_indicators(df: pd.DataFrame, config: Any, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Calculate all configured indicators for a DataFrame
+        Pass `columns` to compute only those indicator columns (see IndicatorPlan)
+        """
+        plan = IndicatorPlan.for_all(config) if columns is None else IndicatorPlan(columns, config)
+        return plan.apply(df)
+    
+    @staticmethod
+    def build_panel(market_data: Dict[str, pd.DataFrame], columns: List[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Align several symbols into (symbols x bars) arrays
+        Series are right-aligned so the latest bar of every symbol shares the
+        last column; shorter histories are padded with NaN at the front.
+        """
+        columns = columns or ['open', 'high', 'low', 'close', 'volume']
+        num_bars = max((len(df) for df in market_data.values()), default=0)
+        panel = {col: np.full((len(market_data), num_bars), np.nan) for col in columns}
+        
+        for row, df in enumerate(market_data.values()):
+            if len(df):
+                for col in columns:
+                    panel[col][row, num_bars - len(df):] = df[col].to_numpy(dtype=np.float64)
         
-        # Simple Moving Averages
-        sma_periods = config.get('indicators', {}).get('sma_periods', [20, 50])
-        for period in sma_periods:
-            result_df[f'sma_{period}'] = TechnicalIndicators.sma(df['close'], period)
+        return panel
+    
+    @staticmethod
+    def calculate_panel(market_data: Dict[str, pd.DataFrame], config: Any,
+                        columns: List[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Calculate all configured indicators for many symbols at once
         
-        # RSI
-        rsi_period = config.get('indicators', {}).get('rsi_period', 14)
-        result_df['rsi'] = TechnicalIndicators.rsi(df['close'], rsi_period)
+        Every indicator is computed by one vectorized kernel call over the
+        aligned (symbols x bars) panel and written into a single
+        (symbols x bars x columns) block; `columns` limits the indicators
+        as in calculate_all_indicators. The returned per-symbol DataFrames
+        are views of that block with the same columns and values as
+        calculate_all_indicators.
+        """
+        block, names = TechnicalIndicators.calculate_panel_block(market_data, config, columns)
         
-        # MACD
-        macd_data = TechnicalIndicators.macd(df['close'])
-        result_df['macd'] = macd_data['macd']
-        result_df['macd_signal'] = macd_data['signal']
-        result_df['macd_histogram'] = macd_data['histogram']
+        results = {}
+        num_bars = block.shape[1]
+        for row, (symbol, df) in enumerate(market_data.items()):
+            view = block[row, num_bars - len(df):, :]
+            results[symbol] = pd.DataFrame(view, index=df.index, columns=names, copy=False)
         
-        # Bollinger Bands
-        bb_data = TechnicalIndicators.bollinger_bands(df['close'])
-        result_df['bb_upper'] = bb_data['upper']
-        result_df['bb_middle'] = bb_data['middle']
-        result_df['bb_lower'] = bb_data['lower']
+        return results
+    
+    @staticmethod
+    def calculate_panel_block(market_data: Dict[str, pd.DataFrame], config: Any,
+                              columns: List[str] = None) -> Tuple[np.ndarray, List[str]]:
+        """
+        Indicator panel as one (symbols x bars x columns) array
+        Returns the block and its column names (OHLCV first); rows follow
+        the order of market_data and are right-aligned as in build_panel.
+        """
+        panel = TechnicalIndicators.build_panel(market_data)
+        plan = IndicatorPlan.for_all(config) if columns is None else IndicatorPlan(columns, config)
         
-        # Stochastic
-        stoch_data = TechnicalIndicators.stochastic(df['high'], df['low'], df['close'])
-        result_df['stoch_k'] = stoch_data['k']
-        result_df['stoch_d'] = stoch_data['d']
+        base_columns = list(panel)
+        block = np.empty(panel['close'].shape + (len(base_columns) + len(plan.columns),))
+        for i, col in enumerate(base_columns):
+            block[..., i] = panel[col]
+        plan.execute(panel, out=block[..., len(base_columns):])
         
-        return result_df
+        return block, base_columns + plan.columns
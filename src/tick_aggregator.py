@@ -0,0 +1,178 @@
+"""
+Tick Aggregator Module
+Event-driven tick-to-bar aggregation feeding the signal pipeline
+"""
+
+import logging
+from typing import AsyncIterable, Callable, Dict, Iterable, Tuple
+import numpy as np
+import pandas as pd
+
+from .bar_buffer import BarRingBuffer
+from .resampler import parse_timeframe
+
+Tick = Tuple[str, int, float, float]
+
+
+class _OpenBar:
+    """Bar that is still being built from ticks"""
+
+    __slots__ = ('bucket', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, bucket: int, price: float, size: float):
+        self.bucket = bucket
+        self.open = self.high = self.low = self.close = price
+        self.volume = size
+
+
+class TickBarAggregator:
+    """
+    Builds fixed-interval OHLCV bars from a stream of ticks
+
+    Ticks are (symbol, timestamp, price, size) tuples where the timestamp is
+    nanoseconds since the epoch (anything pd.Timestamp accepts also works,
+    at a higher per-tick cost). Each symbol keeps one open bar as plain
+    floats and its closed bars in a BarRingBuffer. When a tick falls into a
+    new interval the open bar is closed, appended to the buffer and
+    `on_bar(symbol, window)` is called with the buffer-backed window, e.g.:
+
+        aggregator = TickBarAggregator(
+            '1h', on_bar=lambda symbol, df: signal_generator.generate_signals({symbol: df})
+        )
+        aggregator.run(tick_stream)
+    """
+
+    def __init__(self,
+                 timeframe: str = '1h',
+                 on_bar: Callable[[str, pd.DataFrame], None] = None,
+                 capacity: int = 100):
+        self.logger = logging.getLogger(__name__)
+        self.timeframe = timeframe
+        self.bucket_ns = parse_timeframe(timeframe).value
+        self.on_bar = on_bar
+        self.capacity = capacity
+        self._open: Dict[str, _OpenBar] = {}
+        self._buffers: Dict[str, BarRingBuffer] = {}
+
+    def _buffer(self, symbol: str) -> BarRingBuffer:
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            buffer = self._buffers[symbol] = BarRingBuffer(self.capacity)
+        return buffer
+
+    def _emit(self, symbol: str, bucket: int, values):
+        buffer = self._buffer(symbol)
+        buffer.append(np.array([bucket * self.bucket_ns], dtype='datetime64[ns]'),
+                      np.asarray(values, dtype=np.float64).reshape(1, -1))
+        if self.on_bar:
+            try:
+                self.on_bar(symbol, buffer.to_frame())
+            except Exception as e:
+                self.logger.error(f"Error handling closed bar for {symbol}: {str(e)}")
+
+    def _close(self, symbol: str, bar: _OpenBar):
+        self._emit(symbol, bar.bucket, (bar.open, bar.high, bar.low, bar.close, bar.volume))
+
+    def add_tick(self, symbol: str, timestamp, price: float, size: float = 0.0):
+        """Feed a single tick"""
+        if not isinstance(timestamp, (int, np.integer)):
+            timestamp = pd.Timestamp(timestamp).value
+        bucket = timestamp // self.bucket_ns
+
+        bar = self._open.get(symbol)
+        if bar is None:
+            self._open[symbol] = _OpenBar(bucket, price, size)
+            return
+
+        if bucket != bar.bucket:
+            self._close(symbol, bar)
+            self._open[symbol] = _OpenBar(bucket, price, size)
+            return
+
+        if price > bar.high:
+            bar.high = price
+        elif price < bar.low:
+            bar.low = price
+        bar.close = price
+        bar.volume += size
+
+    def add_ticks(self, symbol: str, timestamps: np.ndarray, prices: np.ndarray, sizes: np.ndarray = None):
+        """
+        Feed a block of ticks for one symbol with vectorized aggregation
+
+        Args:
+            timestamps: Increasing tick timestamps (datetime64 or int nanoseconds)
+            prices: Tick prices
+            sizes: Tick sizes (defaults to zero volume)
+        """
+        ts_ns = np.asarray(timestamps)
+        if ts_ns.dtype.kind == 'M':
+            ts_ns = ts_ns.astype('datetime64[ns]').astype(np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+        sizes = np.zeros_like(prices) if sizes is None else np.asarray(sizes, dtype=np.float64)
+        if len(prices) == 0:
+            return
+
+        buckets = ts_ns // self.bucket_ns
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(buckets)) + 1))
+        ends = np.append(starts[1:], len(buckets)) - 1
+
+        opens = prices[starts]
+        highs = np.maximum.reduceat(prices, starts)
+        lows = np.minimum.reduceat(prices, starts)
+        closes = prices[ends]
+        volumes = np.add.reduceat(sizes, starts)
+        group_buckets = buckets[starts]
+
+        # The first group may continue the symbol's open bar
+        bar = self._open.get(symbol)
+        first = 0
+        if bar is not None and bar.bucket == group_buckets[0]:
+            bar.high = max(bar.high, highs[0])
+            bar.low = min(bar.low, lows[0])
+            bar.close = closes[0]
+            bar.volume += volumes[0]
+            first = 1
+        if len(starts) > first and bar is not None:
+            self._close(symbol, bar)
+
+        for i in range(first, len(starts) - 1):
+            self._emit(symbol, int(group_buckets[i]), (opens[i], highs[i], lows[i], closes[i], volumes[i]))
+
+        if len(starts) > first:
+            last = len(starts) - 1
+            bar = _OpenBar(int(group_buckets[last]), float(opens[last]), float(volumes[last]))
+            bar.high = float(highs[last])
+            bar.low = float(lows[last])
+            bar.close = float(closes[last])
+            self._open[symbol] = bar
+
+    def run(self, ticks: Iterable[Tick]) -> int:
+        """Consume a (symbol, timestamp, price, size) iterable; returns the tick count"""
+        count = 0
+        add_tick = self.add_tick
+        for symbol, timestamp, price, size in ticks:
+            add_tick(symbol, timestamp, price, size)
+            count += 1
+        return count
+
+    async def run_async(self, ticks: AsyncIterable[Tick]) -> int:
+        """Consume an async iterator of ticks; returns the tick count"""
+        count = 0
+        add_tick = self.add_tick
+        async for symbol, timestamp, price, size in ticks:
+            add_tick(symbol, timestamp, price, size)
+            count += 1
+        return count
+
+    def flush(self, symbol: str = None):
+        """Close open bars (of one symbol or all) without waiting for the next interval"""
+        symbols = [symbol] if symbol else list(self._open)
+        for sym in symbols:
+            bar = self._open.pop(sym, None)
+            if bar is not None:
+                self._close(sym, bar)
+
+    def get_frame(self, symbol: str) -> pd.DataFrame:
+        """Closed bars of a symbol as a buffer-backed DataFrame"""
+        return self._buffer(symbol).to_frame()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for rule evaluation on the streaming path
+Runs a config with a rule outside the streaming indicator set through
+warm_up()/process_bar() and checks that it is skipped with a warning while
+the other rules keep producing signals.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+from src.config import AppConfig
+from src.market_simulator import MarketSimulator
+from src.signal_generator import SignalGenerator
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_config(directory):
+    config = {
+        'trading': {'symbols': ['BTCUSD'], 'max_signals_per_hour': 10},
+        'indicators': {'sma_periods': [20, 50], 'extra': ['atr']},
+        'notifications': {'min_confidence': 65},
+        'signals': {
+            'rules': ['above_sma', 'above_sma_atr'],
+            'definitions': {
+                'above_sma': [{'action': 'buy', 'when': 'close > sma_20', 'confidence': 90}],
+                'above_sma_atr': [{'action': 'buy', 'when': 'close > sma_20 + 0.1 * atr', 'confidence': 90}],
+            },
+            'cooldown': {'state_file': os.path.join(directory, 'cooldown.json')},
+            'rate_limit': {'state_file': os.path.join(directory, 'rate.json')},
+        },
+    }
+    path = os.path.join(directory, 'config.json')
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    return AppConfig(path)
+
+
+def test_streaming_skips_batch_only_rule():
+    handler = RecordingHandler()
+    logging.getLogger('src').addHandler(handler)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            generator = SignalGenerator()
+            generator.config = make_config(directory)
+
+            history = MarketSimulator().generate_frame('BTCUSD', 100)
+            generator.warm_up('BTCUSD', history)
+            close = float(history['close'].iloc[-1]) * 1.5
+            signals = generator.process_bar('BTCUSD', close, close, close, close, 1.0)
+
+            # The batch path still runs the ATR rule
+            batch_rules = {rule.name for group in generator._rule_set().rules for rule in group}
+            assert batch_rules == {'above_sma', 'above_sma_atr'}
+    finally:
+        logging.getLogger('src').removeHandler(handler)
+
+    errors = [r.getMessage() for r in handler.records if r.levelno >= logging.ERROR]
+    assert not errors, errors
+    warnings = [r.getMessage() for r in handler.records if r.levelno == logging.WARNING]
+    assert any('above_sma_atr' in message and 'atr' in message for message in warnings), warnings
+    assert [s.rule for s in signals] == ['above_sma'], signals
+
+
+if __name__ == '__main__':
+    test_streaming_skips_batch_only_rule()
+    print("✅ Streaming rules test passed")
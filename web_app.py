@@ -11,7 +11,9 @@ from flask_cors import CORS
 import os
 import json
 from datetime import datetime, timedelta
+from typing import Optional
 from src.signal_history import SignalHistory
+from src.signal_record import Action as SignalAction, Signal as SignalRecord
 
 app = Flask(__name__)
 CORS(app)
@@ -69,6 +71,17 @@ class Signal(db.Model):
             'criado_em': self.criado_em.isoformat() if self.criado_em else None
         }
 
+    def to_record(self) -> Optional[SignalRecord]:
+        """Stored signal as a SignalRecord, stamped with its creation time (None for an unknown direcao)"""
+        try:
+            return SignalRecord(self.ativo, self.direcao, self.preco, self.confianca,
+                                self.indicadores.split(', ') if self.indicadores else (),
+                                self.criado_em.isoformat() if self.criado_em else '',
+                                self.detalhes)
+        except ValueError:
+            app.logger.warning("Skipping signal %s with unknown direcao %r", self.id, self.direcao)
+            return None
+
 # Initialize signal history
 signal_history = SignalHistory()
 
@@ -349,6 +362,12 @@ def receive_signal():
     if not ativo or not direcao:
         return jsonify({'message': 'Ativo e direção são obrigatórios'}), 400
 
+    # Stored as 'compra'/'venda' whichever schema the client used
+    try:
+        direcao = SignalAction.parse(direcao).portuguese
+    except ValueError:
+        return jsonify({'message': 'Direção inválida'}), 400
+
     # Convert indicators list to string if needed
     if isinstance(indicadores, list):
         indicadores = ', '.join(indicadores)
@@ -382,32 +401,12 @@ def get_signals():
         json_signals = signal_history.get_recent_signals(limit=10)
         
         # Format database signals
-        formatted_signals = []
-        for signal in db_signals:
-            formatted_signals.append({
-                'symbol': signal.ativo,
-                'action': signal.direcao,
-                'price': float(signal.preco) if signal.preco else 0,
-                'confidence': float(signal.confianca) if signal.confianca else 0,
-                'timestamp': signal.criado_em.isoformat() if signal.criado_em else '',
-                'indicators': signal.indicadores.split(', ') if signal.indicadores else [],
-                'details': signal.detalhes or '',
-                'source': 'database'
-            })
+        records = (signal.to_record() for signal in db_signals)
+        formatted_signals = [dict(record.to_dict(), source='database') for record in records if record is not None]
         
         # Add JSON signals if database is empty
         if not formatted_signals and json_signals:
-            for signal in json_signals:
-                formatted_signals.append({
-                    'symbol': signal.get('symbol', 'Unknown'),
-                    'action': signal.get('action', 'unknown'),
-                    'price': float(signal.get('price', 0)),
-                    'confidence': float(signal.get('confidence', 0)),
-                    'timestamp': signal.get('timestamp', ''),
-                    'indicators': signal.get('indicators', []),
-                    'details': signal.get('details', ''),
-                    'source': 'json'
-                })
+            formatted_signals = [dict(signal.to_dict(), source='json') for signal in json_signals]
         
         return jsonify({
             'signals': formatted_signals,